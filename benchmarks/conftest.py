@@ -0,0 +1,16 @@
+import datetime
+
+import pytest
+
+from example_project.example.models import Example
+
+
+@pytest.fixture
+def example() -> Example:
+    return Example(
+        first_name="foo",
+        last_name="bar",
+        age=20,
+        number=4,
+        timestamp=datetime.datetime(2024, 2, 29, 12, 30, tzinfo=datetime.UTC),
+    )
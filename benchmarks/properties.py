@@ -0,0 +1,14 @@
+__all__ = [
+    "ALL_PROPERTIES",
+    "PROPERTIES",
+]
+
+# Lookup properties on the 'Example' model grouped by the converters used to generate them.
+PROPERTIES: dict[str, list[str]] = {
+    "string": ["full_name", "upper", "lpad", "replace", "substr_length", "md5", "coalesce_2"],
+    "math": ["combined_expression_add", "abs_", "sqrt", "power", "round_2", "greatest"],
+    "datetime": ["trunc_month", "trunc_week", "extract_week", "extract_iso_weekday"],
+    "lookups": ["q", "q_in_list", "q_icontains", "q_range", "q_regex", "q_iregex", "q_or", "case"],
+}
+
+ALL_PROPERTIES: list[str] = [name for names in PROPERTIES.values() for name in names]
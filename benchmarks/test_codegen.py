@@ -0,0 +1,25 @@
+import dataclasses
+
+import pytest
+
+from benchmarks.properties import ALL_PROPERTIES
+from example_project.example.models import Example
+from lookup_property.converters.main import ast_module_to_code, code_to_function, query_expression_ast_module
+from lookup_property.field import LookupPropertyDescriptor
+
+
+@pytest.mark.benchmark(group="codegen")
+@pytest.mark.parametrize("name", ALL_PROPERTIES)
+def test_benchmark__codegen(benchmark, name):
+    descriptor: LookupPropertyDescriptor = getattr(Example, name)
+    expression = descriptor.inlined_expression
+
+    # Code generation happens lazily, so benchmark the generation itself instead of creating the descriptor.
+    def generate() -> None:
+        state = dataclasses.replace(descriptor.state)
+        state.model = Example
+        module = query_expression_ast_module(expression=expression, function_name=name, state=state)
+        code = ast_module_to_code(module=module, filename=__file__)
+        code_to_function(code=code, function_name=name, state=state)
+
+    benchmark(generate)
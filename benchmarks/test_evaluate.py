@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.properties import PROPERTIES
+from example_project.example.models import Example
+
+
+@pytest.mark.benchmark(group="get-string")
+@pytest.mark.parametrize("name", PROPERTIES["string"])
+def test_benchmark__get__string(benchmark, example, name):
+    descriptor = getattr(Example, name)
+    benchmark(descriptor.__get__, example, Example)
+
+
+@pytest.mark.benchmark(group="get-math")
+@pytest.mark.parametrize("name", PROPERTIES["math"])
+def test_benchmark__get__math(benchmark, example, name):
+    descriptor = getattr(Example, name)
+    benchmark(descriptor.__get__, example, Example)
+
+
+@pytest.mark.benchmark(group="get-datetime")
+@pytest.mark.parametrize("name", PROPERTIES["datetime"])
+def test_benchmark__get__datetime(benchmark, example, name):
+    descriptor = getattr(Example, name)
+    benchmark(descriptor.__get__, example, Example)
+
+
+@pytest.mark.benchmark(group="get-lookups")
+@pytest.mark.parametrize("name", PROPERTIES["lookups"])
+def test_benchmark__get__lookups(benchmark, example, name):
+    descriptor = getattr(Example, name)
+    benchmark(descriptor.__get__, example, Example)
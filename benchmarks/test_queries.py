@@ -0,0 +1,35 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS
+
+from benchmarks.properties import ALL_PROPERTIES
+from example_project.example.models import Example, Thing
+from lookup_property import L
+
+
+@pytest.mark.benchmark(group="resolve")
+@pytest.mark.parametrize("name", ALL_PROPERTIES)
+def test_benchmark__resolve__annotate(benchmark, name):
+    benchmark(lambda: Example.objects.annotate(value=L(name)).query)
+
+
+@pytest.mark.benchmark(group="resolve")
+def test_benchmark__resolve__filter(benchmark):
+    benchmark(lambda: Example.objects.filter(L(full_name__contains="foo")).query)
+
+
+@pytest.mark.benchmark(group="resolve")
+def test_benchmark__resolve__filter__related(benchmark):
+    benchmark(lambda: Thing.objects.filter(L(example__full_name__contains="foo")).query)
+
+
+@pytest.mark.benchmark(group="compile")
+@pytest.mark.parametrize("name", ALL_PROPERTIES)
+def test_benchmark__compile__annotate(benchmark, name):
+    query = Example.objects.annotate(value=L(name)).query
+    benchmark(lambda: query.get_compiler(DEFAULT_DB_ALIAS).as_sql())
+
+
+@pytest.mark.benchmark(group="compile")
+def test_benchmark__compile__filter__related(benchmark):
+    query = Thing.objects.filter(L(example__full_name__contains="foo")).query
+    benchmark(lambda: query.get_compiler(DEFAULT_DB_ALIAS).as_sql())
@@ -0,0 +1,39 @@
+import pytest
+from django.db import models
+from django.db.models.functions import Upper
+
+from lookup_property.expressions import extend_expression_to_joined_table
+
+DEPTHS = [10, 50, 100, 200]
+
+
+def nested_case(depth: int) -> models.Case:
+    expression: models.Expression = models.Value("default")
+    for i in range(depth):
+        expression = models.Case(
+            models.When(models.Q(number=i), then=Upper(models.Value(f"value_{i}"))),
+            default=expression,
+            output_field=models.CharField(),
+        )
+    return expression
+
+
+def nested_q(depth: int) -> models.Q:
+    expression = models.Q(number=0)
+    for i in range(1, depth):
+        expression = models.Q(number=i) | (models.Q(name=models.F("other")) & expression)
+    return expression
+
+
+@pytest.mark.benchmark(group="rewrite-case")
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_benchmark__extend_expression_to_joined_table__case(benchmark, depth):
+    expression = nested_case(depth)
+    benchmark(extend_expression_to_joined_table, expression, "example")
+
+
+@pytest.mark.benchmark(group="rewrite-q")
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_benchmark__extend_expression_to_joined_table__q(benchmark, depth):
+    expression = nested_q(depth)
+    benchmark(extend_expression_to_joined_table, expression, "example")
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:01
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [  # noqa: RUF012
+        ("example", "0001_initial"),
+    ]
+
+    operations = [  # noqa: RUF012
+        migrations.AddField(
+            model_name="example",
+            name="_materialized_materialized_full_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Concat(
+                    models.F("first_name"), models.Value(" "), models.F("last_name"), output_field=models.CharField()
+                ),
+                output_field=models.CharField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="example",
+            name="_materialized_materialized_upper",
+            field=models.GeneratedField(
+                db_persist=False,
+                expression=django.db.models.functions.text.Upper(
+                    models.F("first_name"), output_field=models.CharField()
+                ),
+                output_field=models.CharField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [  # noqa: RUF012
+        ("example", "0002_materialized_lookup_properties"),
+    ]
+
+    operations = [  # noqa: RUF012
+        migrations.AddIndex(
+            model_name="example",
+            index=models.Index(
+                django.db.models.functions.text.Upper("first_name"), name="example_exa_upper_327ef7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="example",
+            index=models.Index(fields=["_materialized_materialized_full_name"], name="example_exa_materia_d5e14d_idx"),
+        ),
+    ]
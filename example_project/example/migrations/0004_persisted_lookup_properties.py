@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [  # noqa: RUF012
+        ("example", "0003_lookup_property_indexes"),
+    ]
+
+    operations = [  # noqa: RUF012
+        migrations.AddField(
+            model_name="example",
+            name="_persisted_persisted_count_rel",
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
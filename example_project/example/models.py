@@ -8,7 +8,7 @@
 from django.db.models.functions import MD5, Random
 
 from example_project.example.utils import SubqueryCount
-from lookup_property import L, lookup_property
+from lookup_property import L, LookupPropertyQuerySet, lookup_property
 
 
 class Other(models.Model):
@@ -36,6 +36,8 @@ class Example(models.Model):
     question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name="example")
     children = models.ManyToManyField(Child, related_name="examples")
 
+    objects = LookupPropertyQuerySet.as_manager()
+
     @lookup_property()
     def full_name() -> str:
         return functions.Concat(  # type: ignore[return-value]
@@ -45,6 +47,15 @@ def full_name() -> str:
             output_field=models.CharField(),
         )
 
+    @lookup_property(lazy_codegen=True)
+    def lazy_full_name() -> str:
+        return functions.Concat(  # type: ignore[return-value]
+            models.F("first_name"),
+            models.Value(" "),
+            models.F("last_name"),
+            output_field=models.CharField(),
+        )
+
     @lookup_property
     def number_in_range() -> bool:
         return models.Q(number__lt=10)  # type: ignore[return-value]
@@ -176,7 +187,7 @@ def trunc_date() -> datetime.date:
     def trunc_time() -> datetime.time:
         return functions.TruncTime("timestamp")  # type: ignore[return-value]
 
-    @lookup_property
+    @lookup_property(index=True)
     def upper() -> str:
         return functions.Upper("first_name")  # type: ignore[return-value]
 
@@ -858,6 +869,56 @@ def exists() -> bool:
     def _(self) -> bool:
         return Total.objects.filter(example=self, number=1).exists()
 
+    @lookup_property(cache=True)
+    def cached_full_name() -> str:
+        return functions.Concat(  # type: ignore[return-value]
+            models.F("first_name"),
+            models.Value(" "),
+            models.F("last_name"),
+            output_field=models.CharField(),
+        )
+
+    @lookup_property(cache=True)
+    def cached_count_rel() -> int:
+        return aggregates.Count("totals__pk")  # type: ignore[return-value]
+
+    @lookup_property(materialize="stored", index=True)
+    def materialized_full_name() -> str:
+        return functions.Concat(  # type: ignore[return-value]
+            models.F("first_name"),
+            models.Value(" "),
+            models.F("last_name"),
+            output_field=models.CharField(),
+        )
+
+    @lookup_property(materialize="virtual")
+    def materialized_upper() -> str:
+        return functions.Upper(models.F("first_name"), output_field=models.CharField())  # type: ignore[return-value]
+
+    @lookup_property(persist=True)
+    def persisted_count_rel() -> int:
+        return aggregates.Count("totals__pk")  # type: ignore[return-value]
+
+    @lookup_property
+    def age_plus_count_rel() -> int:
+        return models.F("age") + aggregates.Count("totals__pk")  # type: ignore[return-value]
+
+    @lookup_property
+    def q_iregex_field() -> bool:
+        return models.Q(first_name__iregex=models.F("last_name"))  # type: ignore[return-value]
+
+    @lookup_property(cache=True)
+    def cached_age_plus_count_rel() -> int:
+        return models.F("age") + aggregates.Count("totals__pk")  # type: ignore[return-value]
+
+    @lookup_property
+    def initials() -> str:
+        return functions.Concat(  # type: ignore[return-value]
+            functions.Substr("first_name", 1, 1),
+            functions.Substr("last_name", 1, 1),
+            output_field=models.CharField(),
+        )
+
 
 class Far(models.Model):
     name = models.CharField(max_length=256)
@@ -879,6 +940,8 @@ class Thing(models.Model):
     far = models.OneToOneField(Far, on_delete=models.CASCADE, related_name="thing")
     aliens = models.ManyToManyField(Alien, related_name="things")
 
+    objects = LookupPropertyQuerySet.as_manager()
+
     @lookup_property
     def number_in_range() -> bool:
         return models.Q(number__gt=10)  # type: ignore[return-value]
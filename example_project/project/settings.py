@@ -19,6 +19,7 @@
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "lookup_property",
     "example_project.example",
 ]
 
@@ -1,13 +1,26 @@
 from .converters import convert_django_field, expression_to_ast, lookup_to_ast
 from .decorator import lookup_property
 from .expressions import L
+from .instrumentation import lookup_property_evaluated, track_lookup_properties
+from .queryset import (
+    LookupPropertyQuerySet,
+    batch_lookup_properties,
+    prefetch_lookup_properties,
+    refresh_lookup_properties,
+)
 from .typing import State
 
 __all__ = [
     "L",
+    "LookupPropertyQuerySet",
     "State",
+    "batch_lookup_properties",
     "convert_django_field",
     "expression_to_ast",
     "lookup_property",
+    "lookup_property_evaluated",
     "lookup_to_ast",
+    "prefetch_lookup_properties",
+    "refresh_lookup_properties",
+    "track_lookup_properties",
 ]
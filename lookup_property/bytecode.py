@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib.util
+import inspect
+import marshal
+import os
+import tempfile
+from contextlib import suppress
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import django
+from django.conf import settings
+from django.db import models
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import CodeType, FunctionType
+
+    from .typing import State
+
+__all__ = [
+    "bytecode_cache_path",
+    "read_bytecode",
+    "write_bytecode",
+]
+
+
+CACHE_FILE_SUFFIX = ".lpc"
+
+
+def _package_version() -> str:
+    with suppress(PackageNotFoundError):
+        return version("django-lookup-property")
+    return "unknown"  # pragma: no cover
+
+
+def bytecode_cache_path(
+    func: FunctionType,
+    state: State,
+    dependencies: Iterable[tuple[FunctionType, State]] = (),
+) -> Path | None:
+    """
+    Get the path to the bytecode cache file of the given lookup property function.
+    Dependencies are the functions and states of other lookup properties inlined into the function.
+    Returns None if the bytecode cache is not enabled, or if the source of a function is not available.
+    """
+    cache_dir: str | Path | None = getattr(settings, "LOOKUP_PROPERTY_BYTECODE_CACHE", None)
+    if not cache_dir:
+        return None
+
+    parts: list[str] = []
+    for item_func, item_state in [(func, state), *dependencies]:
+        try:
+            parts.extend(_function_key(item_func, item_state))
+        except (OSError, TypeError):  # pragma: no cover
+            return None
+
+    key = "\n".join(
+        [
+            *parts,
+            repr(_foreign_keys(state.model)),
+            django.get_version(),
+            _package_version(),
+            importlib.util.MAGIC_NUMBER.hex(),
+        ],
+    )
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return Path(cache_dir) / f"{func.__name__}-{digest}{CACHE_FILE_SUFFIX}"
+
+
+def _function_key(func: FunctionType, state: State) -> list[str]:
+    options = [(item.name, getattr(state, item.name)) for item in dataclasses.fields(state) if item.init]
+    return [
+        inspect.getsource(func),
+        func.__module__,
+        func.__qualname__,
+        func.__code__.co_filename,
+        repr(options),
+    ]
+
+
+def _foreign_keys(model: type[models.Model] | None) -> list[tuple[str, str, str | None]]:
+    # Code generation reads foreign key values from the model instead of the related objects when possible.
+    if model is None:
+        return []
+    return [
+        (field.name, field.attname, field.remote_field.field_name)
+        for field in model._meta.fields
+        if isinstance(field, models.ForeignKey)
+    ]
+
+
+def read_bytecode(path: Path) -> tuple[str, CodeType] | None:
+    """Read the generated source and code object from the given cache file, if it exists and is valid."""
+    try:
+        source, code = marshal.loads(path.read_bytes())  # noqa: S302
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return source, code
+
+
+def write_bytecode(path: Path, source: str, code: CodeType) -> None:
+    """Write the generated source and code object to the given cache file. Failures are ignored."""
+    with suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first and move it in place,
+        # so that concurrent processes never read a partially written file.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(marshal.dumps((source, code)))
+            Path(tmp_name).replace(path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
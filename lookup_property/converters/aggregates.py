@@ -7,7 +7,7 @@
 from lookup_property.typing import State
 
 from .expressions import expression_to_ast
-from .utils import ast_function, ast_method
+from .utils import ast_method, ast_property
 
 
 @expression_to_ast.register
@@ -27,16 +27,28 @@ def _(
        def foo():
            return Max("field", default=0, filter=Q(field__gt=10))
 
-    -> def foo(random_string=lambda: Max("field", default=0, filter=Q(field__gt=10))):
-           return self.__class__.objects.aggregate(random_string=random_string())["random_string"]
+    -> random_string = Max("field", default=0, filter=Q(field__gt=10))
+
+       def foo(self):
+           qs = self.__class__._base_manager.filter(pk=self.pk)
+           return qs.aggregate(random_string=random_string)["random_string"]
     """
-    arg_name = state.extra_kwargs.add(lambda: expression)
+    return aggregate_to_ast(expression, state)
+
+
+def aggregate_to_ast(expression: aggregates.Aggregate, state: State) -> ast.Subscript:
+    """Aggregate the given expression over the rows related to the model instance, i.e. as if it was annotated."""
+    arg_name = state.extra_globals.add(expression)
 
     return ast.Subscript(
-        value=ast_method(
-            "aggregate",
-            ["__class__", "objects"],
-            **{arg_name: ast_function(arg_name)},
+        value=ast.Call(
+            func=ast.Attribute(
+                value=ast_method("filter", ["__class__", "_base_manager"], pk=ast_property("pk")),
+                attr="aggregate",
+                ctx=ast.Load(),
+            ),
+            args=[],
+            keywords=[ast.keyword(arg=arg_name, value=ast.Name(id=arg_name, ctx=ast.Load()))],
         ),
         slice=ast.Constant(value=arg_name),
         ctx=ast.Load(),
@@ -72,17 +84,7 @@ def _(
         ),
         state: State,
     ) -> ast.Subscript:
-        arg_name = state.extra_kwargs.add(lambda: expression)
-
-        return ast.Subscript(
-            value=ast_method(
-                "aggregate",
-                ["__class__", "objects"],
-                **{arg_name: ast_function(arg_name)},
-            ),
-            slice=ast.Constant(value=arg_name),
-            ctx=ast.Load(),
-        )
+        return aggregate_to_ast(expression, state)
 
 except ModuleNotFoundError:
     pass
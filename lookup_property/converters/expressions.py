@@ -9,7 +9,7 @@
 
 from lookup_property.typing import State
 
-from .utils import ast_function, ast_property
+from .utils import ast_property
 
 __all__ = [
     "expression_to_ast",
@@ -19,18 +19,21 @@
 @singledispatch
 def expression_to_ast(expression: object, state: State) -> ast.AST:
     """
-    Default converter for all objects, which works by setting a new keyword argument:
+    Default converter for all objects, which works by binding the object to a new global variable
+    of the generated function:
 
     def func(self):
         return Q(foo=datetime.date(2000, 1, 1))
 
     ->
 
-    def foo(self, random_string=lambda: datetime.date(2000, 1, 1)):
-        return self.foo == random_string()
+    random_string = datetime.date(2000, 1, 1)
+
+    def foo(self):
+        return self.foo == random_string
     """
-    arg = state.extra_kwargs.add(lambda: expression)
-    return ast_function(arg)
+    name = state.extra_globals.add(expression)
+    return ast.Name(id=name, ctx=ast.Load())
 
 
 @expression_to_ast.register
@@ -81,7 +84,7 @@ def _(expression: models.F, state: State) -> ast.Attribute:
     F("foo") -> self.foo
     F("foo__bar") -> self.foo.bar
     """
-    return ast_property(*expression.name.split(LOOKUP_SEP))
+    return ast_property(*expression.name.split(LOOKUP_SEP), state=state)
 
 
 _BIN_OP_MAP: dict[str, ast.operator] = {
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ast
+import re
 from typing import Any
 
 from django.db import models
@@ -12,13 +13,17 @@
 from lookup_property.typing import State
 
 from .expressions import expression_to_ast
-from .utils import ast_method, ast_property
+from .utils import REGEX_COMPILER, ast_function, ast_method, ast_property, holds_hashable_values
 
 __all__ = [
     "lookup_to_ast",
 ]
 
 
+# Types of values that can be used as constants in the generated code.
+CONSTANT_TYPES = (str, int, float, bool, bytes, type(None))
+
+
 @expression_to_ast.register
 def _(expression: L, state: State) -> ast.AST:  # pragma: no cover
     """
@@ -27,7 +32,7 @@ def _(expression: L, state: State) -> ast.AST:  # pragma: no cover
     L(foo__endswith="bar") -> self.foo.endswith("bar")
     """
     if not hasattr(expression, "value"):
-        return ast_property(*expression.lookup.split(LOOKUP_SEP))
+        return ast_property(*expression.lookup.split(LOOKUP_SEP), state=state)
 
     return to_lookup_comparison(attr=expression.lookup, value=expression.value, state=state)
 
@@ -105,7 +110,7 @@ def to_lookup_comparison(attr: str, value: Any, state: State) -> ast.AST:
 def lookup_to_ast(lookup: str, attrs: list[str], value: Any, state: State) -> ast.Compare:
     """Default behavior. Q(foo__bar=1) -> self.foo.bar == 1"""
     return ast.Compare(
-        left=ast_property(*attrs, lookup),
+        left=ast_property(*attrs, lookup, state=state),
         ops=[ast.Eq()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -118,7 +123,7 @@ def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
     Q(foo__exact="bar") -> self.foo == "bar"
     """
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.Eq()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -151,7 +156,7 @@ def _(attrs: list[str], value: str | None, state: State) -> ast.AST | ast.Compar
 def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
     """Q(foo__gt=1) -> self.foo > 1"""
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.Gt()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -161,7 +166,7 @@ def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
 def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
     """Q(foo__gte=1) -> self.foo >= 1"""
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.GtE()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -171,7 +176,7 @@ def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
 def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
     """Q(foo__lt=1) -> self.foo < 1"""
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.Lt()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -181,7 +186,7 @@ def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
 def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
     """Q(foo__lte=1) -> self.foo <= 1"""
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.LtE()],
         comparators=[expression_to_ast(value, state)],
     )
@@ -189,21 +194,45 @@ def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
 
 @lookup_to_ast.register(lookup=lookups.In.lookup_name)
 def _(attrs: list[str], value: Any, state: State) -> ast.Compare:
-    """Q(foo__in=[1, 2]) -> self.foo in [1, 2]"""
+    """Q(foo__in=[1, 2]) -> self.foo in {1, 2}"""
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.In()],
-        comparators=[expression_to_ast(value, state)],
+        comparators=[in_values_to_ast(value, state, hashable=holds_hashable_values(attrs, state))],
     )
 
 
+def in_values_to_ast(value: Any, state: State, *, hashable: bool) -> ast.AST:
+    """
+    Convert the values of an `in` lookup to a set, so that membership is checked by hash instead of
+    comparing to each value. A set of constants is compiled to a frozenset constant by python, and other
+    hashable values are captured as a frozenset. Unhashable values and expressions are kept as they are.
+    Sets can only be used if the field is known to hold hashable values, since checking if e.g. a list
+    is in a set raises a `TypeError`.
+    """
+    if not hashable or not isinstance(value, list | tuple | set | frozenset) or not value:
+        return expression_to_ast(value, state)
+
+    if all(type(item) in CONSTANT_TYPES for item in value):
+        return ast.Set(elts=[ast.Constant(value=item) for item in value])
+
+    if any(hasattr(item, "resolve_expression") for item in value):
+        return expression_to_ast(value, state)
+
+    try:
+        values = frozenset(value)
+    except TypeError:
+        return expression_to_ast(value, state)
+    return ast.Name(id=state.extra_globals.add(values), ctx=ast.Load())
+
+
 @lookup_to_ast.register(lookup=lookups.Contains.lookup_name)
 def _(attrs: list[str], value: str, state: State) -> ast.Compare:
     """Q(foo__contains="bar") -> "bar" in self.foo"""
     return ast.Compare(
         left=expression_to_ast(value, state),
         ops=[ast.In()],
-        comparators=[ast_property(*attrs)],
+        comparators=[ast_property(*attrs, state=state)],
     )
 
 
@@ -292,7 +321,7 @@ def _(attrs: list[str], value: tuple[Any, Any], state: State) -> ast.Compare:
         left=expression_to_ast(value[0], state),
         ops=[ast.Lt(), ast.Lt()],
         comparators=[
-            ast_property(*attrs),
+            ast_property(*attrs, state=state),
             expression_to_ast(value[1], state),
         ],
     )
@@ -305,7 +334,7 @@ def _(attrs: list[str], value: bool, state: State) -> ast.Compare:  # noqa: FBT0
     Q(foo__isnull=False) -> self.foo is not None
     """
     return ast.Compare(
-        left=ast_property(*attrs),
+        left=ast_property(*attrs, state=state),
         ops=[ast.Is() if value is True else ast.IsNot()],
         comparators=[expression_to_ast(None, state)],
     )
@@ -313,41 +342,28 @@ def _(attrs: list[str], value: bool, state: State) -> ast.Compare:  # noqa: FBT0
 
 @lookup_to_ast.register(lookup=lookups.Regex.lookup_name)
 def _(attrs: list[str], value: str, state: State) -> ast.Compare:
-    """Q(foo__regex=r".*") -> re.match(r".*", self.foo) is not None"""
-    state.imports.add("re")
-    return ast.Compare(
-        left=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="re", ctx=ast.Load()),
-                attr="match",
-                ctx=ast.Load(),
-            ),
-            args=[
-                expression_to_ast(value, state),
-                ast_property(*attrs),
-            ],
-            keywords=[],
-        ),
-        ops=[ast.IsNot()],
-        comparators=[expression_to_ast(None, state)],
-    )
+    """Q(foo__regex=r".*") -> pattern.match(self.foo) is not None, where pattern = re.compile(r".*")"""
+    return regex_match(attrs, value, flags=0, state=state)
 
 
 @lookup_to_ast.register(lookup=lookups.IRegex.lookup_name)
 def _(attrs: list[str], value: str, state: State) -> ast.Compare:
-    """Q(foo__iregex=r".*") -> re.match(r".*", self.foo.casefold()) is not None"""
-    state.imports.add("re")
+    """Q(foo__iregex=r".*") -> pattern.match(self.foo) is not None, where pattern = re.compile(r".*", re.IGNORECASE)"""
+    return regex_match(attrs, value, flags=re.IGNORECASE, state=state)
+
+
+def regex_match(attrs: list[str], value: Any, flags: int, state: State) -> ast.Compare:
+    pattern: ast.AST
+    if isinstance(value, str):
+        # Literal patterns are compiled once, when the function is generated.
+        pattern = ast.Name(id=state.extra_globals.add(re.compile(value, flags)), ctx=ast.Load())
+    else:
+        pattern = ast_function(REGEX_COMPILER, (), expression_to_ast(value, state), ast.Constant(value=int(flags)))
+
     return ast.Compare(
         left=ast.Call(
-            func=ast.Attribute(
-                value=ast.Name(id="re", ctx=ast.Load()),
-                attr="match",
-                ctx=ast.Load(),
-            ),
-            args=[
-                expression_to_ast(value, state),
-                ast_method("casefold", attrs),
-            ],
+            func=ast.Attribute(value=pattern, attr="match", ctx=ast.Load()),
+            args=[ast_property(*attrs, state=state)],
             keywords=[],
         ),
         ops=[ast.IsNot()],
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
 import ast
-import itertools
-from functools import partial, wraps
+import re
+import warnings
+from functools import lru_cache
+from types import CodeType
+
+from django.db import models
 
 from lookup_property import expression_to_ast
-from lookup_property.typing import Expr, ModelMethod, State
+from lookup_property.typing import Any, Expr, Literal, ModelMethod, State
+
+from .optimizer import optimize_module
+from .utils import REGEX_COMPILER, RELATED_OBJECT_GETTER
 
 __all__ = [
+    "ast_module_to_code",
     "ast_module_to_function",
     "ast_to_module",
+    "code_to_function",
+    "compile_regex",
+    "get_related_object",
     "query_expression_ast_module",
 ]
 
 
 def query_expression_ast_module(expression: Expr, function_name: str, state: State) -> ast.Module:
     return_value = expression_to_ast(expression, state)
-    return ast_to_module(function_name=function_name, return_value=return_value, state=state)
+    module = ast_to_module(function_name=function_name, return_value=return_value, state=state)
+    if state.optimize:
+        module = optimize_module(module)
+    return module
 
 
 def ast_to_module(function_name: str, return_value: ast.AST, state: State) -> ast.Module:
@@ -34,10 +48,7 @@ def ast_to_module(function_name: str, return_value: ast.AST, state: State) -> as
             ast.FunctionDef(
                 name=function_name,
                 args=ast.arguments(
-                    args=[
-                        ast.arg(arg=name, annotation=None, type_comment=None)
-                        for name in itertools.chain(["self"], state.extra_kwargs)
-                    ],
+                    args=[ast.arg(arg="self", annotation=None, type_comment=None)],
                     defaults=[],
                     vararg=None,
                     kwarg=None,
@@ -60,10 +71,45 @@ def ast_to_module(function_name: str, return_value: ast.AST, state: State) -> as
 
 
 def ast_module_to_function(module: ast.Module, function_name: str, filename: str, state: State) -> ModelMethod:
-    compiled = compile(source=module, filename=filename, mode="exec")
-    namespace: dict[str, ModelMethod] = {}
-    eval(compiled, namespace)  # noqa: S307
-    func = namespace[function_name]
-    if state.extra_kwargs:
-        func = wraps(func)(partial(func, **state.extra_kwargs))
-    return func
+    code = ast_module_to_code(module=module, filename=filename)
+    return code_to_function(code=code, function_name=function_name, state=state)
+
+
+def ast_module_to_code(module: ast.Module, filename: str) -> CodeType:
+    return compile(source=module, filename=filename, mode="exec")
+
+
+def code_to_function(code: CodeType, function_name: str, state: State) -> ModelMethod:
+    # Captured values are bound as globals of the generated function,
+    # so that they are looked up directly when the function is called.
+    namespace: dict[str, Any] = {
+        RELATED_OBJECT_GETTER: get_related_object,
+        REGEX_COMPILER: compile_regex,
+        **state.extra_globals,
+    }
+    eval(code, namespace)  # noqa: S307
+    return namespace[function_name]  # type: ignore[no-any-return]
+
+
+def get_related_object(instance: models.Model, name: str, strict: Literal["raise", "warn"]) -> models.Model | None:
+    """Get a related object from a model instance, and raise an error or warn if it needs to be fetched."""
+    field = instance._meta.get_field(name)
+    if not field.is_cached(instance):  # type: ignore[union-attr]
+        # Forward relations are not fetched if the foreign key is null.
+        is_null = isinstance(field, models.ForeignKey) and None in field.get_local_related_value(instance)
+        if not is_null:
+            msg = (
+                f"Related object '{name}' of '{instance._meta.label}' has not been fetched. "
+                f"Use 'select_related' to fetch it with the model instance."
+            )
+            if strict == "raise":
+                raise ValueError(msg)
+            warnings.warn(msg, RuntimeWarning, stacklevel=3)
+
+    return getattr(instance, name)
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str, flags: int) -> re.Pattern[str]:
+    """Compile a regular expression that is not known beforehand, e.g., a pattern from a model field."""
+    return re.compile(pattern, flags)
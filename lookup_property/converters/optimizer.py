@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import ast
+import itertools
+import operator
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = [
+    "eliminate_common_subexpressions",
+    "fold_constants",
+    "optimize_module",
+]
+
+
+# Calls that can return a different value each time they are called,
+# and thus cannot be evaluated only once even if they are repeated.
+IMPURE_CALLS: set[str] = {
+    "random.random",
+}
+
+# Nodes that have their own scope, so assignment expressions inside them
+# would not be visible outside, or are not allowed at all.
+OPAQUE_NODES = (
+    ast.Lambda,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+)
+
+VARIABLE_PREFIX = "_v"
+
+# Maximum length of a folded string or bytes, or bit length of an integer, so that folding
+# doesn't make the generated code, or the time it takes to generate it, too large.
+MAX_FOLDED_SIZE = 4096
+
+# Maximum exponent and shift amount of folded powers and left shifts.
+MAX_FOLDED_EXPONENT = 128
+
+FOLDABLE_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+BINARY_OPERATORS: dict[type[ast.operator], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.BitAnd: operator.and_,
+}
+
+UNARY_OPERATORS: dict[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+    ast.Invert: operator.invert,
+}
+
+COMPARISON_OPERATORS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+def optimize_module(module: ast.Module) -> ast.Module:
+    """Optimize the return values of the functions in the given module generated from a lookup property."""
+    # Converters can reuse the same node in multiple places, so make sure all nodes are unique.
+    module = _unshare(module)
+    names = (f"{VARIABLE_PREFIX}{i}" for i in itertools.count())
+
+    for node in ast.walk(module):
+        if isinstance(node, ast.Return) and node.value is not None:
+            node.value = fold_constants(node.value)
+            node.value = eliminate_common_subexpressions(node.value, names)
+
+    ast.fix_missing_locations(module)
+    return module
+
+
+def fold_constants(expression: ast.expr) -> ast.expr:
+    """
+    Evaluate operations that only contain constants, and remove branches of conditional expressions
+    that can never be evaluated.
+
+    self.foo + ('a' + 'b') if 1 + 1 == 2 else self.bar
+    -> self.foo + 'ab'
+    """
+    return ConstantFolder().visit(expression)
+
+
+class ConstantFolder(ast.NodeTransformer):
+    def visit(self, node: ast.AST) -> ast.AST:
+        # Lambdas and comprehensions are left as is, like in common subexpression elimination.
+        if isinstance(node, OPAQUE_NODES):
+            return node
+        return super().visit(node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+        if not (_is_constant(node.left) and _is_constant(node.right)):
+            return node
+
+        left: Any = node.left.value  # type: ignore[attr-defined]
+        right: Any = node.right.value  # type: ignore[attr-defined]
+        if not _is_safe_to_fold(node.op, left, right):
+            return node
+
+        return _fold(node, BINARY_OPERATORS[type(node.op)], left, right)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        self.generic_visit(node)
+        if not _is_constant(node.operand):
+            return node
+
+        return _fold(node, UNARY_OPERATORS[type(node.op)], node.operand.value)  # type: ignore[attr-defined]
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        if not all(_is_constant(operand) for operand in operands):
+            return node
+
+        values: list[Any] = [operand.value for operand in operands]  # type: ignore[attr-defined]
+        for op, left, right in zip(node.ops, values, values[1:], strict=False):
+            # Identity of other constants than singletons depends on the python implementation.
+            if isinstance(op, ast.Is | ast.IsNot) and not (_is_singleton(left) or _is_singleton(right)):
+                return node
+
+            result = _fold(node, COMPARISON_OPERATORS[type(op)], left, right)
+            if not isinstance(result, ast.Constant):
+                return node
+            if not result.value:
+                return result
+
+        return ast.copy_location(ast.Constant(value=True), node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        self.generic_visit(node)
+        values = list(node.values)
+
+        # Leading constants either decide the result (falsy for 'and', truthy for 'or'),
+        # or can be skipped, since the next value is evaluated next anyway.
+        short_circuits_on = isinstance(node.op, ast.Or)
+        while len(values) > 1 and _is_constant(values[0]):
+            if bool(values[0].value) is short_circuits_on:  # type: ignore[attr-defined]
+                return values[0]
+            values.pop(0)
+
+        if len(values) == 1:
+            return values[0]
+
+        node.values = values
+        return node
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.expr:
+        self.generic_visit(node)
+        if not _is_constant(node.test):
+            return node
+
+        return node.body if node.test.value else node.orelse  # type: ignore[attr-defined]
+
+
+@dataclass(slots=True)
+class Occurrence:
+    node: ast.expr
+    regions: tuple[int, ...]
+    """Conditional regions the node is in, from outermost to innermost."""
+
+    def dominates(self, other: Occurrence) -> bool:
+        """Is this occurrence always evaluated before the other occurrence?"""
+        return other.regions[: len(self.regions)] == self.regions
+
+
+def eliminate_common_subexpressions(expression: ast.expr, names: itertools.Iterator[str]) -> ast.expr:
+    """
+    Evaluate repeated sub-expressions only once by assigning them to a variable
+    with an assignment expression when they are first evaluated.
+
+    self.foo.bar if self.foo.bar is not None else None
+    -> _v0 if (_v0 := self.foo.bar) is not None else None
+    """
+    while True:
+        collector = OccurrenceCollector()
+        collector.collect(expression)
+
+        candidate = _find_candidate(collector.occurrences)
+        if candidate is None:
+            return expression
+
+        first, others = candidate
+        name = next(names)
+        replacements: dict[int, ast.expr] = {
+            id(first.node): ast.NamedExpr(target=ast.Name(id=name, ctx=ast.Store()), value=first.node),
+        }
+        for other in others:
+            replacements[id(other.node)] = ast.Name(id=name, ctx=ast.Load())
+
+        expression = NodeReplacer(replacements).visit(expression)
+
+
+def _find_candidate(occurrences: dict[str, list[Occurrence]]) -> tuple[Occurrence, list[Occurrence]] | None:
+    """
+    Find the largest repeated sub-expression, where the first evaluated occurrence
+    is always evaluated before at least one other occurrence.
+    """
+    best: tuple[Occurrence, list[Occurrence]] | None = None
+    best_size = 0
+
+    for found in occurrences.values():
+        if len(found) < 2:  # noqa: PLR2004
+            continue
+
+        size = _node_size(found[0].node)
+        if size <= best_size:
+            continue
+
+        for i, first in enumerate(found):
+            dominated = [other for other in found[i + 1 :] if first.dominates(other)]
+            if dominated:
+                best = (first, dominated)
+                best_size = size
+                break
+
+    return best
+
+
+def _is_candidate(node: ast.AST) -> bool:
+    """Whether the node is a value expression that could be assigned to a variable."""
+    # Slices and starred expressions are only valid in specific places, not as values.
+    if not isinstance(node, ast.expr) or isinstance(node, ast.Name | ast.Constant | ast.Slice | ast.Starred):
+        return False
+    return isinstance(getattr(node, "ctx", ast.Load()), ast.Load)
+
+
+class OccurrenceCollector:
+    """Collect sub-expressions that could be evaluated only once, in the order they are evaluated."""
+
+    def __init__(self) -> None:
+        self.occurrences: defaultdict[str, list[Occurrence]] = defaultdict(list)
+        self.regions: tuple[int, ...] = ()
+        self.region_ids = itertools.count()
+
+    def collect(self, node: ast.AST, *, record: bool = True) -> bool:
+        """Collect occurrences from the given node. Return whether the node can be evaluated only once."""
+        if isinstance(node, OPAQUE_NODES):
+            return False
+
+        if isinstance(node, ast.NamedExpr):
+            # Already assigned, so only look for sub-expressions in its value.
+            return self.collect(node.value, record=False)
+
+        pure = self.collect_children(node)
+
+        if record and pure and _is_candidate(node):
+            key = ast.dump(node, annotate_fields=False)
+            self.occurrences[key].append(Occurrence(node=node, regions=self.regions))
+
+        return pure
+
+    def collect_children(self, node: ast.AST) -> bool:
+        """Collect occurrences from the child nodes of the given node in the order they are evaluated."""
+        # Nodes that are evaluated only conditionally are collected in a new region.
+        match node:
+            case ast.IfExp():
+                pure = self.collect(node.test)
+                pure &= self.collect_in_region(node.body)
+                pure &= self.collect_in_region(node.orelse)
+
+            case ast.BoolOp():
+                pure = self.collect(node.values[0])
+                pure &= self.collect_in_regions(node.values[1:])
+
+            case ast.Compare():
+                # In chained comparisons, later comparisons are only evaluated if the earlier ones are true.
+                pure = self.collect(node.left)
+                pure &= self.collect(node.comparators[0])
+                pure &= self.collect_in_regions(node.comparators[1:])
+
+            case ast.Dict():
+                pure = True
+                for key, value in zip(node.keys, node.values, strict=True):
+                    if key is not None:
+                        pure &= self.collect(key)
+                    pure &= self.collect(value)
+
+            case ast.Call():
+                # Functions and methods themselves are not worth assigning to a variable.
+                pure = self.collect(node.func, record=False)
+                pure &= _dotted_name(node.func) not in IMPURE_CALLS
+                for child in itertools.chain(node.args, node.keywords):
+                    pure &= self.collect(child)
+
+            case _:
+                pure = True
+                for child in ast.iter_child_nodes(node):
+                    pure &= self.collect(child)
+
+        return pure
+
+    def collect_in_region(self, node: ast.AST) -> bool:
+        previous = self.regions
+        self.regions = (*previous, next(self.region_ids))
+        try:
+            return self.collect(node)
+        finally:
+            self.regions = previous
+
+    def collect_in_regions(self, nodes: list[ast.expr]) -> bool:
+        """Collect nodes which are each evaluated only if the previous one was evaluated."""
+        previous = self.regions
+        pure = True
+        try:
+            for node in nodes:
+                self.regions = (*self.regions, next(self.region_ids))
+                pure &= self.collect(node)
+        finally:
+            self.regions = previous
+        return pure
+
+
+class NodeReplacer(ast.NodeTransformer):
+    def __init__(self, replacements: dict[int, ast.expr]) -> None:
+        self.replacements = replacements
+
+    def visit(self, node: ast.AST) -> ast.AST:
+        replacement = self.replacements.get(id(node))
+        if replacement is not None:
+            return replacement
+        return super().visit(node)
+
+
+def _is_constant(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, FOLDABLE_TYPES)
+
+
+def _is_singleton(value: Any) -> bool:
+    return value is None or value is True or value is False
+
+
+def _is_safe_to_fold(op: ast.operator, left: Any, right: Any) -> bool:
+    """Check that the result of the given operation will not be excessively large."""
+    if isinstance(op, ast.Pow | ast.LShift):
+        return not isinstance(right, int) or abs(right) <= MAX_FOLDED_EXPONENT
+    if isinstance(op, ast.Mult):
+        for sequence, count in ((left, right), (right, left)):
+            if isinstance(sequence, str | bytes) and isinstance(count, int):
+                return len(sequence) * count <= MAX_FOLDED_SIZE
+    return True
+
+
+def _fold(node: ast.expr, func: Callable[..., Any], *args: Any) -> ast.expr:
+    """Evaluate the given function with the given arguments, and return the result as a constant if possible."""
+    try:
+        value = func(*args)
+    except Exception:  # noqa: BLE001
+        # Leave the error to be raised when the generated function is called.
+        return node
+
+    if not isinstance(value, FOLDABLE_TYPES):
+        return node
+    if isinstance(value, str | bytes) and len(value) > MAX_FOLDED_SIZE:
+        return node
+    if isinstance(value, int) and abs(value).bit_length() > MAX_FOLDED_SIZE:
+        return node
+
+    return ast.copy_location(ast.Constant(value=value), node)
+
+
+def _unshare(node: Any) -> Any:
+    """Copy the given AST so that every node in it is a separate object, unlike with 'deepcopy'."""
+    if isinstance(node, list):
+        return [_unshare(item) for item in node]
+    if not isinstance(node, ast.AST):
+        return node
+
+    fields = {name: _unshare(getattr(node, name)) for name in node._fields if hasattr(node, name)}
+    return ast.copy_location(type(node)(**fields), node)
+
+
+def _node_size(node: ast.AST) -> int:
+    return sum(1 for child in ast.walk(node) if not isinstance(child, ast.expr_context))
+
+
+def _dotted_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted_name(node.value)}.{node.attr}"
+    return ""
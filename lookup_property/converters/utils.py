@@ -2,16 +2,62 @@
 
 import ast
 
-from lookup_property.typing import Iterable
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+
+from lookup_property.typing import Iterable, State
 
 __all__ = [
+    "REGEX_COMPILER",
+    "RELATED_OBJECT_GETTER",
     "ast_attribute",
     "ast_function",
     "ast_method",
     "ast_property",
+    "attribute_paths",
+    "holds_hashable_values",
 ]
 
 
+# Name of the function used to get related objects in strict mode.
+# Added to the globals of all generated functions.
+RELATED_OBJECT_GETTER = "_get_related_object"
+
+# Types of model fields that are known to hold hashable python values.
+HASHABLE_FIELD_TYPES = frozenset(
+    {
+        "AutoField",
+        "BigAutoField",
+        "BigIntegerField",
+        "BooleanField",
+        "CharField",
+        "DateField",
+        "DateTimeField",
+        "DecimalField",
+        "DurationField",
+        "EmailField",
+        "FilePathField",
+        "FloatField",
+        "GenericIPAddressField",
+        "IntegerField",
+        "PositiveBigIntegerField",
+        "PositiveIntegerField",
+        "PositiveSmallIntegerField",
+        "SlugField",
+        "SmallAutoField",
+        "SmallIntegerField",
+        "TextField",
+        "TimeField",
+        "URLField",
+        "UUIDField",
+    }
+)
+
+# Name of the function used to compile regular expressions that are not known beforehand.
+# Added to the globals of all generated functions.
+REGEX_COMPILER = "_compile_regex"
+
+
 def ast_function(func_name: str, attrs: Iterable[str] = (), *args: ast.AST, **kwargs: ast.AST) -> ast.Call:
     """
     Transform given attributes and function name to a function call ast node.
@@ -58,11 +104,154 @@ def ast_method(func_name: str, attrs: Iterable[str] = (), *args: ast.AST, **kwar
     return ast_function(func_name, ("self", *attrs), *args, **kwargs)
 
 
-def ast_property(*attrs: str) -> ast.Attribute:
+def ast_property(*attrs: str, state: State | None = None) -> ast.expr:
     """
     Transform given attributes to a class instance attribute/property ast node.
 
     ["foo"] -> self.foo
     ["foo", "foo", "bar"] -> self.foo.foo.bar
+
+    If the state of a lookup property on a model is given, the attributes are checked against the model fields.
+    The primary key (or 'to_field') of a foreign key is read from the foreign key's own attribute,
+    so that the related object is not fetched:
+
+    ["foo", "pk"] -> self.foo_id
+
+    In strict mode, related objects are accessed with a function that checks that they have already been fetched:
+
+    ["foo", "bar"] -> _get_related_object(self, "foo", "raise").bar
+    """
+    if state is None or state.model is None:
+        return ast_attribute("self", *attrs)
+
+    value: ast.expr = ast.Name(id="self", ctx=ast.Load())
+    model: type[models.Model] | None = state.model
+    remaining = list(attrs)
+    while remaining:
+        name = remaining.pop(0)
+        field = _get_related_field(model, name)
+        model = None
+
+        if field is None:
+            value = ast.Attribute(value=value, attr=name, ctx=ast.Load())
+            continue
+
+        if isinstance(field, models.ForeignKey) and remaining and _is_target_field(field, remaining[0]):
+            remaining.pop(0)
+            value = ast.Attribute(value=value, attr=field.attname, ctx=ast.Load())
+            continue
+
+        if state.strict_relations is not None:
+            value = ast.Call(
+                func=ast.Name(id=RELATED_OBJECT_GETTER, ctx=ast.Load()),
+                args=[value, ast.Constant(value=name), ast.Constant(value=state.strict_relations)],
+                keywords=[],
+            )
+        else:
+            value = ast.Attribute(value=value, attr=name, ctx=ast.Load())
+
+        model = _related_model(field)
+
+    return value
+
+
+def holds_hashable_values(attrs: list[str], state: State | None) -> bool:
+    """
+    Are the values of the model field at the end of the given attribute path known to be hashable?
+    Relations and fields that can hold e.g. lists or dicts, like `JSONField`, are not.
     """
-    return ast_attribute("self", *attrs)
+    if state is None or state.model is None:
+        return False
+
+    field: models.Field | models.ForeignObjectRel | None = None
+    model: type[models.Model] | None = state.model
+    for name in attrs:
+        if model is None:
+            return False
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        model = _related_model(field) if field.is_relation else None  # type: ignore[union-attr]
+
+    if field is None or field.is_relation:
+        return False
+    return field.get_internal_type() in HASHABLE_FIELD_TYPES  # type: ignore[union-attr]
+
+
+def attribute_paths(module: ast.Module) -> list[list[str]]:
+    """
+    Find all attribute paths read from the model instance in the given lookup property function.
+
+    self.foo.bar -> ["foo", "bar"]
+    _get_related_object(self, "foo", "raise").bar -> ["foo", "bar"]
+    (_v0 := self.foo).bar + _v0.baz -> ["foo", "bar"], ["foo", "baz"]
+    """
+    # Common subexpressions are assigned to variables, so resolve them to their values.
+    names = {node.target.id: node.value for node in ast.walk(module) if isinstance(node, ast.NamedExpr)}
+
+    paths: list[list[str]] = []
+    for node in ast.walk(module):
+        if isinstance(node, ast.Attribute | ast.Call):
+            path = _attribute_path(node, names)
+            if path:
+                paths.append(path)
+    return paths
+
+
+def _attribute_path(node: ast.expr, names: dict[str, ast.expr]) -> list[str] | None:
+    match node:
+        case ast.Name(id="self"):
+            return []
+        case ast.Name(id=name) if name in names:
+            return _attribute_path(names[name], names)
+        case ast.NamedExpr(value=value):
+            return _attribute_path(value, names)
+        case ast.Attribute(value=value, attr=attr):
+            pass
+        case ast.Call(func=ast.Name(id=func_name), args=[value, ast.Constant(value=str(attr)), *_]) if (
+            func_name == RELATED_OBJECT_GETTER
+        ):
+            pass
+        case _:
+            return None
+
+    path = _attribute_path(value, names)
+    return None if path is None else [*path, attr]
+
+
+def _get_related_field(model: type[models.Model] | None, name: str) -> models.Field | models.ForeignObjectRel | None:
+    """Get the field with the given name from the model, if it's a relation to a single object."""
+    if model is None or name == "pk":
+        return None
+
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+    if not (field.many_to_one or field.one_to_one):
+        return None
+    return field  # type: ignore[return-value]
+
+
+def _is_target_field(field: models.ForeignKey, name: str) -> bool:
+    """Is the given name the field on the related model that the foreign key points to?"""
+    # Target field is only known before the related model has been loaded if 'to_field' is set.
+    target: str | None = field.remote_field.field_name
+    related_model = _related_model(field)
+    if related_model is None:
+        return target is not None and name == target
+
+    pk_name = related_model._meta.pk.name
+    target = target or pk_name
+    return name == target or (name == "pk" and target == pk_name)
+
+
+def _related_model(field: models.Field | models.ForeignObjectRel) -> type[models.Model] | None:
+    if isinstance(field, models.ForeignObjectRel):
+        return field.related_model  # type: ignore[return-value]
+
+    # Related model is still a string if it hasn't been loaded yet.
+    related_model = getattr(field.remote_field, "model", None)
+    return related_model if isinstance(related_model, type) else None
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from copy import copy
+from graphlib import CycleError, TopologicalSorter
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import BaseExpression
+
+from .converters.utils import attribute_paths
+from .expressions import L, _all_same
+from .field import LookupPropertyDescriptor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .typing import Any, Expr
+
+__all__ = [
+    "inline_lookup_properties",
+    "lookup_property_graph",
+    "related_lookups",
+]
+
+
+def related_lookups(model: type[models.Model], *lookups: str) -> tuple[list[str], list[str]]:
+    """
+    Find the related objects that the given lookup properties read when they are evaluated in python,
+    and return them as lookups for `select_related` and `prefetch_related`. Lookup properties on
+    related models can be given using the `__` separator, e.g. `"related__lookup_property"`.
+    """
+    collector = RelatedLookupCollector()
+    for lookup in lookups:
+        *path, name = lookup.split(LOOKUP_SEP)
+        collector.add_lookup(model, path, name)
+
+    return _without_prefixes(collector.select_related), _without_prefixes(collector.prefetch_related)
+
+
+class RelatedLookupCollector:
+    """
+    Collect the relations used by lookup properties from the generated python functions,
+    since those are exactly the attributes read on model instances. For example, a foreign key's
+    primary key is read from the model itself (`self.foo_id`), so it doesn't need the related object.
+    """
+
+    def __init__(self) -> None:
+        self.select_related: set[str] = set()
+        self.prefetch_related: set[str] = set()
+        self.seen: set[tuple[type[models.Model], str, tuple[str, ...]]] = set()
+
+    def add_lookup(self, model: type[models.Model], path: list[str], name: str) -> None:
+        """Add the relations to and the dependencies of the lookup property at the end of the given path."""
+        prefix: list[str] = []
+        prefetch = False
+        for attr in path:
+            field = _get_relation(model, attr)
+            if field is None:
+                msg = f"'{attr}' is not a relation on model '{model.__name__}'."
+                raise ValueError(msg)
+
+            prefix.append(attr)
+            prefetch = prefetch or _is_prefetch_only(field)
+            model = field.related_model  # type: ignore[assignment]
+
+        if not isinstance(getattr(model, name, None), LookupPropertyDescriptor):
+            msg = f"'{name}' is not a lookup property on model '{model.__name__}'."
+            raise ValueError(msg)  # noqa: TRY004
+
+        if prefix:
+            self.add_relation(prefix, prefetch=prefetch)
+        self.add_property(model, name, tuple(prefix), prefetch=prefetch)
+
+    def add_property(self, model: type[models.Model], name: str, prefix: tuple[str, ...], *, prefetch: bool) -> None:
+        """Add the relations read by the generated function of the given lookup property."""
+        key = (model, name, prefix)
+        if key in self.seen:
+            return
+        self.seen.add(key)
+
+        descriptor: LookupPropertyDescriptor = getattr(model, name)
+        for path in attribute_paths(descriptor.module):
+            self.add_path(model, path, prefix, prefetch=prefetch)
+
+    def add_path(self, model: type[models.Model], path: list[str], prefix: tuple[str, ...], *, prefetch: bool) -> None:
+        relation = list(prefix)
+        for attr in path:
+            # Other lookup properties add the relations they read themselves.
+            if isinstance(getattr(model, attr, None), LookupPropertyDescriptor):
+                self.add_property(model, attr, tuple(relation), prefetch=prefetch)
+                break
+
+            field = _get_relation(model, attr)
+            # Many-related objects are only used in aggregates, which are evaluated in the database.
+            if field is None or field.one_to_many or field.many_to_many:
+                break
+
+            relation.append(attr)
+            prefetch = prefetch or _is_prefetch_only(field)
+            model = field.related_model  # type: ignore[assignment]
+            if model is None:  # Generic foreign keys
+                break
+
+        if len(relation) > len(prefix):
+            self.add_relation(relation, prefetch=prefetch)
+
+    def add_relation(self, relation: list[str], *, prefetch: bool) -> None:
+        lookup = LOOKUP_SEP.join(relation)
+        if prefetch:
+            self.prefetch_related.add(lookup)
+        else:
+            self.select_related.add(lookup)
+
+
+def _get_relation(model: type[models.Model], name: str) -> Any:
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+    # Foreign keys can also be found with their column attribute, e.g. 'foo_id'.
+    if not field.is_relation or field.name != name:
+        return None
+    return field
+
+
+def _is_prefetch_only(field: Any) -> bool:
+    # Many-related objects and generic foreign keys (which have no related model) cannot be used with `select_related`.
+    return bool(field.one_to_many or field.many_to_many or field.related_model is None)
+
+
+def _without_prefixes(lookups: set[str]) -> list[str]:
+    """Remove lookups that are included in longer lookups, e.g. "foo" in "foo__bar"."""
+    return sorted(
+        lookup for lookup in lookups if not any(other.startswith(f"{lookup}{LOOKUP_SEP}") for other in lookups)
+    )
+
+
+def lookup_property_graph(model: type[models.Model], name: str) -> dict[str, set[str]]:
+    """
+    Build the dependency graph of the given lookup property: map it and all lookup properties it
+    references on the same model, directly or through other lookup properties, to the lookup properties
+    they reference. Only references that can be inlined are included, see `inline_lookup_properties`.
+    """
+    graph: dict[str, set[str]] = {}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in graph:
+            continue
+
+        descriptor: LookupPropertyDescriptor = getattr(model, current)
+        graph[current] = references = set(_inlinable_references(model, descriptor.expression))
+        pending.extend(references)
+
+    return graph
+
+
+def inline_lookup_properties(model: type[models.Model], name: str) -> Expr:
+    """
+    Get the expression of the given lookup property with references to other lookup properties
+    on the same model, e.g. `F("full_name")` or `L("full_name")`, replaced with their expressions,
+    so that they are evaluated as one expression in python and in the database.
+
+    Lookup properties that are overridden, cached or concrete are not inlined,
+    since their values are not (necessarily) calculated from their expressions.
+    """
+    graph = lookup_property_graph(model, name)
+    try:
+        order = list(TopologicalSorter(graph).static_order())
+    except CycleError as error:
+        cycle = " -> ".join(error.args[1])
+        msg = f"Lookup properties on model '{model.__name__}' reference each other in a cycle: {cycle}."
+        raise ValueError(msg) from error
+
+    # Dependencies come before the lookup properties that reference them,
+    # so the referenced expressions have already been inlined.
+    inlined: dict[str, Expr] = {}
+    for current in order:
+        descriptor: LookupPropertyDescriptor = getattr(model, current)
+        inlined[current] = _inline_references(descriptor.expression, inlined)
+
+    return inlined[name]
+
+
+def _inlinable_references(model: type[models.Model], expression: Expr) -> Iterator[str]:
+    for reference in _references(expression):
+        descriptor = getattr(model, reference, None)
+        if isinstance(descriptor, LookupPropertyDescriptor) and _can_inline(descriptor):
+            yield reference
+
+
+def _can_inline(descriptor: LookupPropertyDescriptor) -> bool:
+    # Materialized and persisted properties are read from their column, so they are leaves as well.
+    state = descriptor.state
+    return not (state.skip_codegen or state.cache or state.concrete or state.persist or state.materialize is not None)
+
+
+def _references(expression: Expr) -> Iterator[str]:
+    """Find names referenced with `F("name")` or `L("name")` in the given expression."""
+    if _reference_name(expression) is not None:
+        yield _reference_name(expression)  # type: ignore[misc]
+
+    elif isinstance(expression, models.Q):
+        for child in expression.children:
+            yield from _references(child[1] if isinstance(child, tuple) else child)
+
+    # Sub-queries reference fields on another model.
+    elif isinstance(expression, BaseExpression) and not isinstance(expression, models.Subquery):
+        for source in expression.get_source_expressions():
+            yield from _references(source)
+
+
+def _reference_name(expression: Any) -> str | None:
+    # OuterRefs are also F-expressions, but they reference the outer query.
+    if type(expression) is models.F and LOOKUP_SEP not in expression.name:
+        return expression.name
+    if isinstance(expression, L) and isinstance(expression.lookup, str) and not hasattr(expression, "value"):
+        return expression.lookup if LOOKUP_SEP not in expression.lookup else None
+    return None
+
+
+def _inline_references(expression: Expr, inlined: dict[str, Expr]) -> Expr:
+    """
+    Replace references to the given lookup properties with their expressions.
+    Only the parts of the expression that need to be rewritten are copied, others are shared with the original.
+    """
+    name = _reference_name(expression)
+    if name is not None:
+        return inlined.get(name, expression)
+
+    if isinstance(expression, models.Q):
+        children = [_inline_child(child, inlined) for child in expression.children]
+        if _all_same(children, expression.children):
+            return expression
+
+        expression = copy(expression)
+        expression.children = children
+        return expression
+
+    if not isinstance(expression, BaseExpression) or isinstance(expression, models.Subquery):
+        return expression
+
+    source_expressions = expression.get_source_expressions()
+    expressions = [_inline_references(source, inlined) for source in source_expressions]
+    if _all_same(expressions, source_expressions):
+        return expression
+
+    expression = expression.copy()
+    expression.set_source_expressions(expressions)
+    return expression
+
+
+def _inline_child(child: tuple[str, Any] | Expr, inlined: dict[str, Expr]) -> tuple[str, Any] | Expr:
+    if not isinstance(child, tuple):
+        return _inline_references(child, inlined)
+
+    value = _inline_references(child[1], inlined)
+    return child if value is child[1] else (child[0], value)
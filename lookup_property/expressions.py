@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from contextlib import suppress
-from copy import deepcopy
-from functools import cached_property
+from copy import copy
+from functools import cached_property, lru_cache
 from typing import TYPE_CHECKING
 
 from django.core.exceptions import FieldDoesNotExist
@@ -16,7 +16,7 @@
 from .typing import LOOKUP_PREFIX, Sentinel
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
     from django.db.backends.base.base import BaseDatabaseWrapper
     from django.db.models.expressions import Col
@@ -208,12 +208,17 @@ def resolve_expression(
         for_save: bool = False,  # noqa: FBT001, FBT002
     ) -> ExpressionKind:
         """Resolve lookup expression and either return it or build a lookup expression based on it."""
-        field, lookup_parts, joined_tables = self.find_lookup_property_field(query)
-        lookup_name = field.attname.removeprefix(LOOKUP_PREFIX)
-        expression = field.expression
-        for table_name in reversed(joined_tables):
-            expression = extend_expression_to_joined_table(expression, table_name)
+        if isinstance(self.lookup, models.Subquery):
+            field, lookup_parts, joined_tables = self.find_lookup_property_field(query)
+            expression = extend_expression_to_joined_tables(field.expression, joined_tables)
+        else:
+            field, lookup_parts, joined_tables, expression = find_lookup_property_expression(query.model, self.lookup)
+            # Finding the lookup property from a related model joins the base table to the query,
+            # which needs to be done here, since the lookup property was found using a separate query.
+            if joined_tables:
+                query.join(query.base_table_class(query.model._meta.db_table, query.model._meta.db_table))
 
+        lookup_name = field.attname.removeprefix(LOOKUP_PREFIX)
         expression = expression.resolve_expression(query, allow_joins, reuse, summarize, for_save)
 
         # Check whether the query should be grouped by the lookup expression.
@@ -231,7 +236,7 @@ def resolve_expression(
             return expression
 
         value = query.resolve_lookup_value(self.value, reuse, allow_joins, summarize)
-        return query.build_lookup(lookup_parts, expression, value)
+        return query.build_lookup(list(lookup_parts), expression, value)
 
     def find_lookup_property_field(self, query: Query) -> tuple[LookupPropertyField, list[str], list[str]]:
         """
@@ -286,6 +291,34 @@ def find_lookup_property_field(self, query: Query) -> tuple[LookupPropertyField,
         return field, lookup_parts, joined_tables
 
 
+@lru_cache(maxsize=1024)
+def find_lookup_property_expression(
+    model: type[models.Model],
+    lookup: str,
+) -> tuple[LookupPropertyField, tuple[str, ...], tuple[str, ...], Expr]:
+    """
+    Find the lookup property field for the given lookup on the given model,
+    and the lookup property expression rewritten to be referenced from the given model.
+
+    Results are cached, since finding the field and rewriting the expression is the same
+    every time a given lookup is used on a given model. The returned expression is shared,
+    so it should not be modified, but resolved to a new expression instead.
+
+    >>> find_lookup_property_expression(Example, "example__full_name__contains")
+    (LookupPropertyField(<full_name>), ('contains',), ('example',), Concat(...))
+    """
+    field, lookup_parts, joined_tables = L(lookup).find_lookup_property_field(Query(model=model))
+    expression = extend_expression_to_joined_tables(field.expression, joined_tables)
+    return field, tuple(lookup_parts), tuple(joined_tables), expression
+
+
+def extend_expression_to_joined_tables(expression: Expr, joined_tables: Sequence[str]) -> Expr:
+    """Rewrite an expression so that it's referenced through the given tables, from the outermost table."""
+    for table_name in reversed(joined_tables):
+        expression = extend_expression_to_joined_table(expression, table_name)
+    return expression
+
+
 def expression_has_output_field(expression: ExpressionKind) -> bool:  # pragma: no cover
     # Check whether the 'output_field' of the expression can be resolved.
     # This might fail, and does fail for expressions like Trunc if the 'output_field'
@@ -297,14 +330,17 @@ def expression_has_output_field(expression: ExpressionKind) -> bool:  # pragma:
 
 
 def extend_expression_to_joined_table(expression: Expr, table_name: str) -> Expr:
-    """Rewrite an expression so that any containing expressions are referenced from the given table."""
+    """
+    Rewrite an expression so that any containing expressions are referenced from the given table.
+    Only the parts of the expression that need to be rewritten are copied, others are shared with the original.
+    """
     if isinstance(expression, models.F):
-        expression = deepcopy(expression)
+        expression = copy(expression)
         expression.name = f"{table_name}{LOOKUP_SEP}{expression.name}"
         return expression
 
     if isinstance(expression, L):
-        expression = deepcopy(expression)
+        expression = copy(expression)
         expression.lookup = f"{table_name}{LOOKUP_SEP}{expression.lookup}"
         if hasattr(expression, "value"):
             expression.value = (
@@ -315,44 +351,64 @@ def extend_expression_to_joined_table(expression: Expr, table_name: str) -> Expr
         return expression
 
     if isinstance(expression, models.Q):
-        expression = deepcopy(expression)
-        children: list[tuple[str, Any] | models.Q | L] = expression.children  # type: ignore[assignment]
-        expression.children = []
-        for child in children:
+        children: list[tuple[str, Any] | models.Q | L] = []
+        for child in expression.children:
             if isinstance(child, models.Q | L):
-                expression.children.append(extend_expression_to_joined_table(child, table_name))
+                children.append(extend_expression_to_joined_table(child, table_name))
             else:
                 value = (
                     extend_expression_to_joined_table(child[1], table_name)
                     if isinstance(child[1], models.F | models.Q | BaseExpression)
                     else child[1]
                 )
-                expression.children.append((f"{table_name}{LOOKUP_SEP}{child[0]}", value))
+                children.append((f"{table_name}{LOOKUP_SEP}{child[0]}", value))
 
+        expression = copy(expression)
+        expression.children = children
         return expression
 
     # For sub-queries, only OuterRefs are rewritten.
     if isinstance(expression, models.Subquery):
-        expression = deepcopy(expression)
         sub_expressions: list[ExpressionKind] = expression.query.where.children  # type: ignore[assignment]
-        expression.query.where.children = []
-        for child in sub_expressions:
-            expression.query.where.children.append(extend_subquery_to_joined_table(child, table_name))
+        children = [extend_subquery_to_joined_table(child, table_name) for child in sub_expressions]
+        if _all_same(children, sub_expressions):
+            return expression
+
+        expression = expression.copy()
+        expression.query.where.children = children
         return expression
 
-    expression = deepcopy(expression)
-    expressions = [extend_expression_to_joined_table(expr, table_name) for expr in expression.get_source_expressions()]
-    expression.set_source_expressions(expressions)
-    return expression
+    return _extend_source_expressions(expression, extend_expression_to_joined_table, table_name)
 
 
 def extend_subquery_to_joined_table(expression: Expr, table_name: str) -> Expr:
     if isinstance(expression, models.OuterRef | ResolvedOuterRef):
-        expression = deepcopy(expression)
+        expression = copy(expression)
         expression.name = f"{table_name}{LOOKUP_SEP}{expression.name}"
         return expression
 
-    expression = deepcopy(expression)
-    expressions = [extend_subquery_to_joined_table(expr, table_name) for expr in expression.get_source_expressions()]
+    return _extend_source_expressions(expression, extend_subquery_to_joined_table, table_name)
+
+
+def _extend_source_expressions(
+    expression: Expr,
+    extend: Callable[[Expr, str], Expr],
+    table_name: str,
+) -> Expr:
+    # Values like the 'filter' of an aggregate can be None.
+    if expression is None:
+        return expression
+
+    source_expressions = expression.get_source_expressions()
+    expressions = [extend(expr, table_name) for expr in source_expressions]
+    # Share the expression with the original if none of its source expressions were rewritten.
+    if _all_same(expressions, source_expressions):
+        return expression
+
+    expression = expression.copy()
     expression.set_source_expressions(expressions)
     return expression
+
+
+def _all_same(new: list[Any], old: list[Any]) -> bool:
+    return all(new_item is old_item for new_item, old_item in zip(new, old, strict=True))
@@ -2,18 +2,31 @@
 
 import ast
 import inspect
-from functools import cached_property
+import threading
+from collections import defaultdict
+from contextlib import suppress
+from dataclasses import fields
+from functools import cached_property, partial, wraps
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Generic, Unpack
 
+from django.core.exceptions import FieldDoesNotExist, FieldError, ObjectDoesNotExist
 from django.db import models
+from django.db.backends.utils import names_digest
 from django.db.models import ForeignObjectRel
+from django.db.models.base import DEFERRED
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import class_prepared, post_save, pre_save
 
-from .converters.main import ast_module_to_function, query_expression_ast_module
-from .expressions import LookupPropertyCol
-from .typing import LOOKUP_PREFIX, R, Sentinel, State, StateArgs
+from .bytecode import bytecode_cache_path, read_bytecode, write_bytecode
+from .converters.main import ast_module_to_code, code_to_function, query_expression_ast_module
+from .converters.utils import attribute_paths
+from .expressions import L, LookupPropertyCol
+from .instrumentation import evaluate_instrumented, lookup_property_evaluated
+from .typing import LOOKUP_PREFIX, MATERIALIZED_PREFIX, PERSISTED_PREFIX, R, Sentinel, State, StateArgs
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
     from types import FunctionType
 
     from django.db.models.fields.related import ForeignObject, ManyToManyField
@@ -36,23 +49,26 @@ def __init__(self, func: FunctionType, /, **kwargs: Unpack[StateArgs]) -> None:
         self.field: LookupPropertyField = None  # type: ignore[assignment]
 
         self.state = State(**kwargs)
+        if self.state.materialize not in {"stored", "virtual", None}:
+            msg = (
+                f"Lookup property '{func.__name__}' has an invalid `materialize` value {self.state.materialize!r}. "
+                f"Must be one of: 'stored', 'virtual'."
+            )
+            raise ValueError(msg)
+        if self.state.materialize is not None and self.state.persist:
+            msg = f"Lookup property '{func.__name__}' cannot be both materialized and persisted."
+            raise ValueError(msg)
 
         self.__name__ = func.__name__
         self._expression: Callable[[], Expr] = func
+        self._codegen_lock: threading.Lock | None = None
         if self.state.skip_codegen:
             return
 
-        self.module = query_expression_ast_module(
-            expression=self.expression,
-            function_name=func.__code__.co_name,
-            state=self.state,
-        )
-        self.func = ast_module_to_function(
-            module=self.module,
-            function_name=func.__code__.co_name,
-            filename=func.__code__.co_filename,
-            state=self.state,
-        )
+        # Generate the function when the model class has been created (see `contribute_to_class`),
+        # or when the property is first accessed on an instance, whichever happens first.
+        self._codegen_lock = threading.Lock()
+        self.func = self._generate_on_first_call
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.expression})"
@@ -60,15 +76,243 @@ def __repr__(self) -> str:
     def __get__(self, instance: models.Model | None, model: type[models.Model] | None) -> R:
         if instance is None:  # if called on class
             return self
-        cached_value = getattr(instance, self.field.attname, Sentinel)
+        # Values are only in the instance dict if they have been annotated or cached.
+        cached_value = instance.__dict__.get(self.field.attname, Sentinel)
+        if self.state.cache and cached_value is not Sentinel and self._is_stale(instance):
+            cached_value = Sentinel
+        # Instrumentation is enabled by connecting receivers to the signal.
+        if lookup_property_evaluated.receivers:
+            return evaluate_instrumented(self, instance, cached_value)
         if cached_value is not Sentinel:
             return cached_value
-        return self.func(instance)
+        if self.uses_database:
+            return self.evaluate_batched(instance)
+        return self.evaluate(instance)
 
     def __set__(self, instance: models.Model, value: Any) -> None:
         # Cache values from queryset annotations to avoid re-evaluating the property on instances.
         # This does allow overriding the value manually, but that is not recommended.
         setattr(instance, self.field.attname, value)
+        if self.state.cache:
+            instance.__dict__.pop(self._snapshot_key, None)
+
+    def evaluate(self, instance: models.Model) -> R:
+        """
+        Evaluate the lookup property for the given model instance in python,
+        even if it already has a value for the property. If the lookup property
+        is cached, the value is cached on the instance.
+        """
+        values = instance.__dict__
+        for attname in self._concrete_dependencies:
+            # Fields deferred with `only()` or `defer()` are missing from the instance dict.
+            if attname not in values:
+                value = self._evaluate_deferred(instance)
+                break
+        else:
+            value = self.func(instance)
+
+        if self.state.cache:
+            setattr(instance, self.field.attname, value)
+            instance.__dict__[self._snapshot_key] = self._snapshot(instance)
+        return value
+
+    def evaluate_batched(self, instance: models.Model) -> R:
+        """
+        Evaluate the lookup property for the given model instance. If the lookup property needs the database,
+        doesn't have a value yet, and the instance was fetched from a queryset with `batch_lookup_properties`,
+        the lookup property is evaluated for all instances fetched with it in a single query.
+        """
+        # Stale cached values are evaluated in python, since the instance has been modified after fetching it.
+        if self.uses_database and self.field.attname not in instance.__dict__:
+            siblings = getattr(getattr(instance, "_state", None), "lookup_property_siblings", None)
+            if siblings:
+                # Cached values are snapshotted, so that they are re-evaluated if the instance is modified.
+                self._fetch_many(siblings, snapshot=self.state.cache)
+                value = instance.__dict__.get(self.field.attname, Sentinel)
+                if value is not Sentinel:
+                    return value
+        return self.evaluate(instance)
+
+    @cached_property
+    def uses_database(self) -> bool:
+        """Whether evaluating the lookup property in python makes database queries, e.g., for aggregates."""
+        if self.state.joins:
+            return True
+        expression = self.inlined_expression
+        if not hasattr(expression, "flatten"):
+            return False
+        return any(
+            getattr(expr, "contains_aggregate", False) or getattr(expr, "subquery", False)
+            for expr in expression.flatten()
+        )
+
+    def clear_cache(self, instance: models.Model) -> None:
+        """Remove the value of the lookup property from the given model instance, if it has one."""
+        instance.__dict__.pop(self.field.attname, None)
+        instance.__dict__.pop(self._snapshot_key, None)
+
+    @cached_property
+    def _snapshot_key(self) -> str:
+        # Cannot clash with attribute names, since it's not a valid identifier.
+        return f"{self.field.attname}:snapshot"
+
+    @cached_property
+    def _dependencies(self) -> list[Callable[[models.Model], Any]]:
+        """Getters for the attributes of the model instance read by the generated function."""
+        names = dict.fromkeys(path[0] for path in attribute_paths(self.module))
+        return [getter for name in names if (getter := _snapshot_getter(self.field.model, name)) is not None]
+
+    @cached_property
+    def _concrete_dependencies(self) -> tuple[str, ...]:
+        """Attribute names of the concrete fields of the model read by the generated function."""
+        if self.field is None:
+            return ()
+
+        attnames: dict[str, None] = {}
+        for path in attribute_paths(self.module):
+            try:
+                field = self.field.model._meta.get_field(path[0])
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                attnames[field.attname] = None  # type: ignore[union-attr]
+        return tuple(attnames)
+
+    def _evaluate_deferred(self, instance: models.Model) -> R:
+        """Evaluate the lookup property for a model instance that has deferred fields read by the function."""
+        # Only saved model instances can have deferred fields.
+        if not isinstance(instance, models.Model) or instance.pk is None:
+            return self.func(instance)
+
+        if self.uses_database and not self.state.skip_codegen:
+            # The function makes queries anyway, so calculate the value in the database
+            # instead of loading the deferred fields first.
+            with suppress(ObjectDoesNotExist):
+                return self._query(type(instance), [instance.pk]).get()[1]  # type: ignore[no-any-return]
+            return self.func(instance)
+
+        # Load all deferred fields with one query, instead of one query per field.
+        deferred = [attname for attname in self._concrete_dependencies if attname not in instance.__dict__]
+        instance.refresh_from_db(fields=deferred)
+        return self.func(instance)
+
+    def _snapshot(self, instance: models.Model) -> tuple[Any, ...]:
+        return tuple(getter(instance) for getter in self._dependencies)
+
+    def _is_stale(self, instance: models.Model) -> bool:
+        snapshot = instance.__dict__.get(self._snapshot_key)
+        # Values from queryset annotations don't have a snapshot.
+        if snapshot is None:
+            return False
+        # Compare by identity, since assigning an attribute always replaces the object.
+        return any(value is not getter(instance) for value, getter in zip(snapshot, self._dependencies, strict=True))
+
+    def evaluate_many(self, instances: Iterable[models.Model]) -> list[R]:
+        """
+        Evaluate the lookup property for the given model instances with a single query per model,
+        and cache the values on the instances. Instances which already have a value for the property,
+        e.g., from a queryset annotation, are not fetched again.
+        """
+        instances = list(instances)
+        self._fetch_many(instances)
+        return [self.__get__(instance, type(instance)) for instance in instances]
+
+    def _fetch_many(self, instances: list[models.Model], *, snapshot: bool = False) -> None:
+        missing: defaultdict[type[models.Model], defaultdict[Any, list[models.Model]]]
+        missing = defaultdict(lambda: defaultdict(list))
+        for instance in instances:
+            # Unsaved instances can only be evaluated in python.
+            if instance.pk is not None and self.field.attname not in instance.__dict__:
+                missing[type(instance)][instance.pk].append(instance)
+
+        for model, instances_by_pk in missing.items():
+            for pk, value in self._query(model, instances_by_pk):
+                for instance in instances_by_pk[pk]:
+                    self.__set__(instance, value)
+                    if snapshot:
+                        instance.__dict__[self._snapshot_key] = self._snapshot(instance)
+
+    def _query(self, model: type[models.Model], pks: Iterable[Any]) -> models.QuerySet:
+        """Query the primary keys and values of the lookup property for the given primary keys."""
+        # Persisted values might be out of date, so calculate the value like it would be calculated in python.
+        expression = self.inlined_expression if self.state.persist else L(self.__name__)
+        return (
+            model._base_manager.filter(pk__in=pks)
+            .values("pk")  # Select only the primary key, and group by it if the property contains aggregates.
+            .annotate(**{self.__name__: expression})
+            .values_list("pk", self.__name__)
+        )
+
+    def _generate(self) -> None:
+        """Generate the python function from the lookup property expression."""
+        func = self._expression
+        # Changes to inlined lookup properties also change the generated function.
+        dependencies = [(dependency._expression, dependency.state) for dependency in self._inlined_dependencies()]
+        cache_path = bytecode_cache_path(func, self.state, dependencies)  # type: ignore[arg-type]
+        cached = read_bytecode(cache_path) if cache_path is not None else None
+        if cached is not None:
+            self.func_source, code = cached
+            self.func = code_to_function(code=code, function_name=func.__code__.co_name, state=self.state)
+            return
+
+        self.module = query_expression_ast_module(
+            expression=self.inlined_expression,
+            function_name=func.__code__.co_name,
+            state=self.state,
+        )
+        code = ast_module_to_code(module=self.module, filename=func.__code__.co_filename)
+        self.func = code_to_function(code=code, function_name=func.__code__.co_name, state=self.state)
+
+        # Captured values cannot be serialized, so functions using them are not cached.
+        if cache_path is not None and not self.state.extra_globals:
+            write_bytecode(cache_path, source=ast.unparse(self.module), code=code)
+
+    def _inlined_dependencies(self) -> list[LookupPropertyDescriptor]:
+        """Other lookup properties on the same model that are inlined into the expression of this one."""
+        if self.field is None:
+            return []
+
+        from .dependencies import lookup_property_graph  # noqa: PLC0415
+
+        model = self.field.model
+        name = self.field.attname.removeprefix(LOOKUP_PREFIX)
+        return [getattr(model, other) for other in sorted(lookup_property_graph(model, name)) if other != name]
+
+    def _ensure_generated(self) -> None:
+        """Generate the function if code generation was deferred. Safe to call from multiple threads."""
+        lock = self._codegen_lock
+        if lock is None:
+            return
+
+        with lock:
+            if self._codegen_lock is not None:
+                self._generate()
+                self._codegen_lock = None
+
+    def _generate_on_first_call(self, instance: models.Model) -> R:
+        self._ensure_generated()
+        return self.func(instance)
+
+    def _on_class_prepared(self, sender: type[models.Model], **kwargs: Any) -> None:
+        class_prepared.disconnect(self._on_class_prepared, sender=sender)
+        # Other lookup properties referenced by the expression are available only after all fields have been added.
+        if self.state.materialize is not None:
+            self._check_database_expression("materialized")
+        # Persisted lookup properties are indexed by their column, so their expression can be anything.
+        if self.state.index and not self.state.persist:
+            self._check_database_expression("indexed")
+        if self._codegen_lock is not None and not self.state.lazy_codegen:
+            self._ensure_generated()
+
+    def _copy(self) -> LookupPropertyDescriptor[R]:
+        """Copy the lookup property for a model that inherits it from an abstract model."""
+        kwargs = {item.name: getattr(self.state, item.name) for item in fields(self.state) if item.init}
+        descriptor: LookupPropertyDescriptor[R] = LookupPropertyDescriptor(self._expression, **kwargs)  # type: ignore[arg-type]
+        # Overridden functions don't depend on the model, unlike generated ones.
+        if self.state.skip_codegen and hasattr(self, "func"):
+            descriptor.func = self.func
+            descriptor.module = self.module
+        return descriptor
 
     def override(self, func: FunctionType) -> None:
         """Override generated function with a custom one."""
@@ -99,15 +343,179 @@ def contribute_to_class(
         cls._meta.add_field(field, private=True)
         setattr(cls, name, self)
 
+        materialize = self.state.materialize is not None and not cls._meta.abstract
+        if materialize:
+            cls.add_to_class(f"{MATERIALIZED_PREFIX}{name}", self._materialized_field())
+
+        if self.state.persist and not cls._meta.abstract:
+            cls.add_to_class(f"{PERSISTED_PREFIX}{name}", self._persisted_field())
+            pre_save.connect(self._persist_on_save, sender=cls, weak=False)
+            post_save.connect(self._persist_on_update_fields, sender=cls, weak=False)
+
+        index = self.state.index and not cls._meta.abstract
+        if index:
+            cls._meta.indexes.append(self._index(cls, name))
+            # Migrations only include indexes if they have been defined in the model's Meta.
+            cls._meta.original_attrs.setdefault("indexes", cls._meta.indexes)
+
+        # Model fields are needed for code generation, so wait until all of them have been added to the model.
+        self.state.model = cls
+        if self.state.cache:
+            _clear_cache_on_refresh(cls)
+        if materialize or index or (self._codegen_lock is not None and not self.state.lazy_codegen):
+            class_prepared.connect(self._on_class_prepared, sender=cls, weak=False)
+
+    @property
+    def column_name(self) -> str | None:
+        """Name of the model field that stores the value of the lookup property, if it's materialized or persisted."""
+        if self.state.materialize is not None:
+            return f"{MATERIALIZED_PREFIX}{self.__name__}"
+        if self.state.persist:
+            return f"{PERSISTED_PREFIX}{self.__name__}"
+        return None
+
+    def _output_field(self, kind: str) -> models.Field:
+        try:
+            return self.expression.output_field  # type: ignore[union-attr,no-any-return]
+        except (AttributeError, FieldError):
+            msg = f"{kind} lookup property '{self.__name__}' must have an explicit output field."
+            raise ValueError(msg) from None
+
+    def _materialized_field(self) -> models.GeneratedField:
+        """Create a generated field for storing the value of the lookup property in the database."""
+        return models.GeneratedField(
+            expression=self.expression,
+            output_field=self._output_field("Materialized").clone(),
+            db_persist=self.state.materialize == "stored",
+        )
+
+    def _persisted_field(self) -> models.Field:
+        """Create a field for storing the value of the lookup property in the database when the instance is saved."""
+        _, _, args, kwargs = self._output_field("Persisted").deconstruct()
+        kwargs.update(null=True, blank=True, editable=False)
+        return self._output_field("Persisted").__class__(*args, **kwargs)
+
+    def _persist_on_save(self, sender: type[models.Model], instance: models.Model, raw: bool, **kwargs: Any) -> None:  # noqa: FBT001
+        # Don't evaluate the lookup property for fixtures, which are saved as is.
+        if raw:
+            return
+        setattr(instance, self.column_name, self.func(instance))  # type: ignore[arg-type]
+
+    def _persist_on_update_fields(
+        self,
+        sender: type[models.Model],
+        instance: models.Model,
+        raw: bool,  # noqa: FBT001
+        using: str,
+        update_fields: frozenset[str] | None,
+        **kwargs: Any,
+    ) -> None:
+        # `update_fields` cannot be changed in `pre_save`, so if the stored value was left out
+        # from the saved fields, write the value calculated in `_persist_on_save` separately.
+        if raw or update_fields is None or self.column_name in update_fields:
+            return
+        value = getattr(instance, self.column_name)  # type: ignore[arg-type]
+        sender._base_manager.using(using).filter(pk=instance.pk).update(**{self.column_name: value})
+
+    def _check_database_expression(self, action: str) -> None:
+        """Check that the expression can be written to migrations, e.g., for generated columns or indexes."""
+        nodes = list(self.expression.flatten()) if hasattr(self.expression, "flatten") else [self.expression]
+        joins = any(isinstance(node, models.F) and LOOKUP_SEP in node.name for node in nodes)
+        if joins or self.state.joins or getattr(self.expression, "contains_aggregate", False):
+            msg = f"Lookup property '{self.__name__}' cannot be {action}, since it uses joins or aggregates."
+            raise ValueError(msg)
+
+        if any(getattr(node, "subquery", False) for node in nodes):
+            msg = f"Lookup property '{self.__name__}' cannot be {action}, since it uses subqueries."
+            raise ValueError(msg)
+
+        # Inlined expressions cannot be written to migrations, since they are deconstructed
+        # using the arguments the expressions were originally created with.
+        if self.inlined_expression is not self.expression:
+            msg = f"Lookup property '{self.__name__}' cannot be {action}, since it references other lookup properties."
+            raise ValueError(msg)
+
+    def _index(self, model: type[models.Model], name: str) -> models.Index:
+        """Create an index for the lookup property expression, or the field that stores its value."""
+        table_name = model._meta.db_table
+        index_name = f"{table_name[:11]}_{name[:7]}_{names_digest(table_name, name, length=6)}_idx"
+        # Index names cannot start with an underscore or a number on all databases.
+        if index_name[0] == "_" or index_name[0].isdigit():
+            index_name = f"D{index_name[1:]}"
+
+        if self.column_name is not None:
+            return models.Index(fields=[self.column_name], name=index_name)
+        return models.Index(self.expression, name=index_name)
+
+    @cached_property
+    def module(self) -> ast.Module:
+        # Set during code generation, unless the function was loaded from
+        # the bytecode cache, or code generation has been deferred.
+        self._ensure_generated()
+        if "module" in self.__dict__:
+            return self.__dict__["module"]  # type: ignore[no-any-return]
+        return ast.parse(self.func_source)
+
     @cached_property
     def func_source(self) -> str:
         """Return the source code generated from the decorated function return expression."""
+        self._ensure_generated()
+        if "func_source" in self.__dict__:
+            return self.__dict__["func_source"]  # type: ignore[no-any-return]
         return ast.unparse(self.module)
 
     @cached_property
     def expression(self) -> Expr:
         return self._expression()
 
+    @cached_property
+    def inlined_expression(self) -> Expr:
+        """Expression with references to other lookup properties on the same model replaced with their expressions."""
+        # Lookup properties not added to a model cannot reference other lookup properties.
+        if self.field is None:
+            return self.expression
+
+        from .dependencies import inline_lookup_properties  # noqa: PLC0415
+
+        return inline_lookup_properties(self.field.model, self.field.attname.removeprefix(LOOKUP_PREFIX))
+
+
+def _snapshot_getter(model: type[models.Model], name: str) -> Callable[[models.Model], Any] | None:
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return attrgetter(name)
+
+    # Many-related objects are only used in aggregates, which are evaluated in the database.
+    if field.many_to_many or field.one_to_many:
+        return None
+    # Read related objects from the relation cache, and field values from the instance dict,
+    # so that deferred fields or related objects are not fetched just for the snapshot.
+    if field.is_relation and field.name == name:
+        return partial(field.get_cached_value, default=None)  # type: ignore[union-attr]
+    return partial(_get_instance_value, attname=field.attname)  # type: ignore[union-attr]
+
+
+def _get_instance_value(instance: models.Model, attname: str) -> Any:
+    return instance.__dict__.get(attname, Sentinel)
+
+
+def _clear_cache_on_refresh(model: type[models.Model]) -> None:
+    """Clear cached lookup property values when model instances are refreshed from the database."""
+    refresh_from_db = model.refresh_from_db
+    if getattr(refresh_from_db, "clears_lookup_properties", False):
+        return
+
+    @wraps(refresh_from_db)
+    def wrapper(self: models.Model, *args: Any, **kwargs: Any) -> None:
+        refresh_from_db(self, *args, **kwargs)
+        for field in self._meta.private_fields:
+            if isinstance(field, LookupPropertyField) and field.target_property.state.cache:
+                field.target_property.clear_cache(self)
+
+    wrapper.clears_lookup_properties = True  # type: ignore[attr-defined]
+    model.refresh_from_db = wrapper  # type: ignore[method-assign]
+
 
 class LookupPropertyField(models.Field):
     def __init__(self, model: type[models.Model], target_property: LookupPropertyDescriptor) -> None:
@@ -124,7 +532,11 @@ def __repr__(self) -> str:
 
     @property
     def expression(self) -> Expr:
-        return self.target_property.expression
+        # Materialized and persisted lookup properties are read from the field that stores their value.
+        column_name = self.target_property.column_name
+        if column_name is not None:
+            return models.F(column_name)
+        return self.target_property.inlined_expression
 
     def get_col(  # type: ignore[override]
         self,
@@ -143,14 +555,16 @@ def contribute_to_class(
         name: str,
         private_only: bool = False,  # noqa: FBT001, FBT002
     ) -> None:
-        # Register property on a concrete implementation of an abstract model
-        self.target_property.contribute_to_class(cls, name, private_only=private_only)
+        # Register property on a concrete implementation of an abstract model. Each model gets its own copy
+        # of the lookup property, since its function is generated for the model, and the field is named
+        # after the lookup property instead of this field, which has already been prefixed.
+        target_property = self.target_property._copy()
+        target_property.contribute_to_class(cls, name.removeprefix(LOOKUP_PREFIX), private_only=private_only)
 
     def get_default(self) -> Any:
-        # Default value that makes sure `lookup_property.__get__`
-        # does not consider the field as set right after initialization.
-        # Called by `Model.__init__`.
-        return Sentinel
+        # Called by `Model.__init__`. Deferred values are not set on the instance, so that
+        # `lookup_property.__get__` doesn't consider the field as set right after initialization.
+        return DEFERRED
 
 
 class LazyPathInfo:
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.db import connections
+from django.dispatch import Signal
+
+from .typing import Sentinel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from django.db import models
+
+    from .field import LookupPropertyDescriptor
+    from .typing import Any
+
+__all__ = [
+    "LookupPropertyStats",
+    "PropertyStats",
+    "lookup_property_evaluated",
+    "track_lookup_properties",
+]
+
+
+lookup_property_evaluated = Signal()
+"""
+Sent when a lookup property is accessed on a model instance, if the signal has any receivers.
+Arguments sent with the signal:
+
+- `sender`: The model class of the instance.
+- `instance`: The model instance.
+- `name`: Name of the lookup property.
+- `cached`: Whether the value was already set on the instance, e.g., from a queryset annotation.
+- `duration`: Time in seconds spent evaluating the lookup property in python.
+- `queries`: Number of database queries made while evaluating the lookup property in python.
+"""
+
+
+def evaluate_instrumented(descriptor: LookupPropertyDescriptor, instance: models.Model, cached_value: Any) -> Any:
+    """Evaluate the lookup property on the given instance, and send the `lookup_property_evaluated` signal."""
+    if cached_value is not Sentinel:
+        lookup_property_evaluated.send(
+            sender=type(instance),
+            instance=instance,
+            name=descriptor.__name__,
+            cached=True,
+            duration=0.0,
+            queries=0,
+        )
+        return cached_value
+
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+        start = time.perf_counter()
+        value = descriptor.evaluate_batched(instance)
+        duration = time.perf_counter() - start
+
+    lookup_property_evaluated.send(
+        sender=type(instance),
+        instance=instance,
+        name=descriptor.__name__,
+        cached=False,
+        duration=duration,
+        queries=counter.count,
+    )
+    return value
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the executed queries."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:  # noqa: FBT001
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@dataclass
+class PropertyStats:
+    calls: int = 0
+    """Number of times the lookup property was accessed."""
+    hits: int = 0
+    """Number of times the value was already set on the instance, and it didn't need to be evaluated."""
+    time: float = 0.0
+    """Total time in seconds spent evaluating the lookup property in python."""
+    queries: int = 0
+    """Total number of database queries made while evaluating the lookup property in python."""
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+
+class LookupPropertyStats(dict[str, PropertyStats]):
+    """Statistics of lookup property accesses by lookup property, e.g. `"app_label.Model.full_name"`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def __missing__(self, key: str) -> PropertyStats:
+        stats = self[key] = PropertyStats()
+        return stats
+
+    def record(
+        self,
+        sender: type[models.Model],
+        *,
+        name: str,
+        cached: bool,
+        duration: float,
+        queries: int,
+        **kwargs: Any,
+    ) -> None:
+        with self._lock:
+            stats = self[f"{sender._meta.label}.{name}"]
+            stats.calls += 1
+            stats.hits += cached
+            stats.time += duration
+            stats.queries += queries
+
+
+@contextmanager
+def track_lookup_properties() -> Iterator[LookupPropertyStats]:
+    """
+    Collect statistics of lookup property accesses on model instances, from all threads, inside the context.
+    Queries made by other lookup properties used during the evaluation are included in the query count.
+
+    >>> with track_lookup_properties() as stats:
+    ...     ...
+    >>> stats["app_label.Model.full_name"].queries
+    """
+    stats = LookupPropertyStats()
+    lookup_property_evaluated.connect(stats.record, weak=False)
+    try:
+        yield stats
+    finally:
+        lookup_property_evaluated.disconnect(stats.record)
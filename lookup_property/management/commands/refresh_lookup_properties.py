@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+
+from lookup_property.queryset import persisted_lookup_properties, refresh_lookup_properties
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.core.management import CommandParser
+    from django.db import models
+
+    from lookup_property.field import LookupPropertyDescriptor
+    from lookup_property.typing import Any
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the stored values of persisted lookup properties in chunks. "
+        "Values are calculated in the database, unless the lookup property has a custom python function."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", help="Model to refresh, e.g. 'app_label.Model'.")
+        parser.add_argument("names", nargs="*", help="Persisted lookup properties to refresh. Defaults to all.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of rows to update at a time.")
+        parser.add_argument("--start-after", help="Primary key of the last refreshed row, for resuming a refresh.")
+        parser.add_argument("--python", action="store_true", help="Calculate the values in python.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(str(error)) from error
+
+        try:
+            descriptors = persisted_lookup_properties(model, *options["names"])
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+
+        if not descriptors:
+            msg = f"Model '{model._meta.label}' has no persisted lookup properties."
+            raise CommandError(msg)
+
+        queryset = model._base_manager.order_by("pk")
+        if options["start_after"] is not None:
+            queryset = queryset.filter(pk__gt=options["start_after"])
+
+        total = queryset.count()
+
+        # Lookup properties with custom functions don't necessarily have the same value as their expression.
+        python = options["python"] or any(descriptor.state.skip_codegen for descriptor in descriptors)
+        chunks = (
+            refresh_in_python(queryset, descriptors, options["chunk_size"])
+            if python
+            else refresh_in_database(queryset, descriptors, options["chunk_size"])
+        )
+
+        done = 0
+        for count, last_pk in chunks:
+            done += count
+            self.stdout.write(f"Refreshed {done}/{total} rows of '{model._meta.label}' (last primary key: {last_pk}).")
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {done} rows of '{model._meta.label}'."))
+
+
+def refresh_in_database(
+    queryset: models.QuerySet,
+    descriptors: list[LookupPropertyDescriptor],
+    chunk_size: int,
+) -> Iterator[tuple[int, Any]]:
+    """Refresh the lookup properties with one UPDATE query per chunk. Yields the row count and last primary key."""
+    names = [descriptor.__name__ for descriptor in descriptors]
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+
+        count = refresh_lookup_properties(queryset.model._base_manager.filter(pk__in=pks), *names)
+        yield count, pks[-1]
+        queryset = queryset.filter(pk__gt=pks[-1])
+
+
+def refresh_in_python(
+    queryset: models.QuerySet,
+    descriptors: list[LookupPropertyDescriptor],
+    chunk_size: int,
+) -> Iterator[tuple[int, Any]]:
+    """Refresh the lookup properties with `bulk_update` for each chunk. Yields the row count and last primary key."""
+    fields = [descriptor.column_name for descriptor in descriptors]
+    chunk: list[models.Model] = []
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        for descriptor in descriptors:
+            setattr(instance, descriptor.column_name, descriptor.func(instance))  # type: ignore[arg-type]
+        chunk.append(instance)
+
+        if len(chunk) == chunk_size:
+            queryset.model._base_manager.bulk_update(chunk, fields=fields)  # type: ignore[arg-type]
+            yield len(chunk), chunk[-1].pk
+            chunk = []
+
+    if chunk:
+        queryset.model._base_manager.bulk_update(chunk, fields=fields)  # type: ignore[arg-type]
+        yield len(chunk), chunk[-1].pk
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, models
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
+
+from .dependencies import related_lookups
+from .field import LookupPropertyDescriptor
+from .typing import TModel
+
+if TYPE_CHECKING:
+    from .typing import Any, Iterable, Self
+
+__all__ = [
+    "LookupPropertyQuerySet",
+    "batch_lookup_properties",
+    "prefetch_lookup_properties",
+    "refresh_lookup_properties",
+]
+
+
+class LookupPropertyQuerySet(models.QuerySet[TModel]):
+    """QuerySet with additional methods for working with lookup properties."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._prefetch_lookup_property_lookups: tuple[str, ...] = ()
+        self._batch_lookup_properties = False
+        self._lookup_properties_done = False
+
+    def prefetch_lookup_properties(self, *lookups: str | None) -> Self:
+        """
+        Evaluate the given lookup properties for all instances in the queryset after it has been fetched,
+        using one additional query per lookup property. Lookup properties on related models can be given
+        using the `__` separator, e.g. `"related__lookup_property"`. Passing `None` clears the list.
+        """
+        clone = self._chain()
+        if lookups == (None,):
+            clone._prefetch_lookup_property_lookups = ()
+        else:
+            clone._prefetch_lookup_property_lookups += lookups  # type: ignore[arg-type]
+        return clone
+
+    def batch_lookup_properties(self, *, enabled: bool = True) -> Self:
+        """
+        Make the fetched instances evaluate lookup properties that need the database, e.g., for aggregates,
+        for all instances fetched with the queryset in a single query, when the lookup property is
+        first accessed on any of them.
+        """
+        clone = self._chain()
+        clone._batch_lookup_properties = enabled
+        return clone
+
+    def with_lookup_dependencies(self, *lookups: str) -> Self:
+        """
+        Fetch the related objects that the given lookup properties read when they are evaluated in python
+        using `select_related` and `prefetch_related`, so that accessing the lookup properties on the fetched
+        instances doesn't make additional queries. Lookup properties on related models can be given
+        using the `__` separator, e.g. `"related__lookup_property"`.
+        """
+        select, prefetch = related_lookups(self.model, *lookups)
+        clone = self._chain()
+        if select:
+            clone = clone.select_related(*select)
+        if prefetch:
+            clone = clone.prefetch_related(*prefetch)
+        return clone
+
+    def refresh_lookup_properties(self, *names: str) -> int:
+        """
+        Recalculate the given persisted lookup properties, or all persisted lookup properties
+        of the model if none are given, for the rows in the queryset. Returns the number of rows updated.
+        """
+        return refresh_lookup_properties(self, *names)
+
+    def _clone(self) -> Self:
+        clone = super()._clone()
+        clone._prefetch_lookup_property_lookups = self._prefetch_lookup_property_lookups
+        clone._batch_lookup_properties = self._batch_lookup_properties
+        return clone
+
+    def _fetch_all(self) -> None:
+        super()._fetch_all()
+        if self._lookup_properties_done:
+            return
+
+        # Lookup properties can only be set on model instances, not e.g. on the results of `values()`.
+        if issubclass(self._iterable_class, ModelIterable):
+            if self._batch_lookup_properties:
+                batch_lookup_properties(self._result_cache)
+            if self._prefetch_lookup_property_lookups:
+                prefetch_lookup_properties(self._result_cache, *self._prefetch_lookup_property_lookups)
+        self._lookup_properties_done = True
+
+
+def prefetch_lookup_properties(instances: Iterable[models.Model], *lookups: str) -> None:
+    """
+    Evaluate the given lookup properties for the given model instances using one query per lookup property.
+    Related objects should be fetched beforehand with `select_related` or `prefetch_related`.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+
+    for lookup in lookups:
+        *path, name = lookup.split(LOOKUP_SEP)
+
+        targets = instances
+        for attr in path:
+            targets = _related_instances(targets, attr)
+
+        targets_by_model: defaultdict[type[models.Model], list[models.Model]] = defaultdict(list)
+        for target in targets:
+            targets_by_model[type(target)].append(target)
+
+        for model, model_targets in targets_by_model.items():
+            descriptor = getattr(model, name, None)
+            if not isinstance(descriptor, LookupPropertyDescriptor):
+                msg = f"'{name}' is not a lookup property on model '{model.__name__}'."
+                raise ValueError(msg)  # noqa: TRY004
+
+            descriptor.evaluate_many(model_targets)
+
+
+def batch_lookup_properties(instances: Iterable[models.Model]) -> None:
+    """
+    Make the given model instances evaluate lookup properties that need the database
+    for all of the instances in a single query, when the lookup property is first accessed on any of them.
+    """
+    siblings = LookupPropertySiblings(instances)
+    for instance in siblings:
+        instance._state.lookup_property_siblings = siblings  # type: ignore[attr-defined]
+
+
+class LookupPropertySiblings(list[models.Model]):
+    """Model instances that evaluate lookup properties together."""
+
+    def __reduce__(self) -> tuple[type[LookupPropertySiblings], tuple[()]]:
+        # Don't pickle or copy the other instances with each instance.
+        return LookupPropertySiblings, ()
+
+
+def _related_instances(instances: list[models.Model], attr: str) -> list[models.Model]:
+    related: list[models.Model] = []
+    for instance in instances:
+        # Skip missing related objects, e.g., for reverse one-to-one relations, like `prefetch_related` does.
+        try:
+            value = getattr(instance, attr)
+        except ObjectDoesNotExist:
+            continue
+        if value is None:
+            continue
+        # Many-related managers use the `prefetch_related` cache if it exists.
+        if isinstance(value, models.Manager):
+            related.extend(value.all())
+        else:
+            related.append(value)
+    return related
+
+
+def refresh_lookup_properties(queryset: models.QuerySet, *names: str) -> int:
+    """
+    Recalculate the given persisted lookup properties, or all persisted lookup properties of the model
+    if none are given, for the rows in the given queryset with a single UPDATE query.
+    Returns the number of rows updated.
+    """
+    descriptors = persisted_lookup_properties(queryset.model, *names)
+    if not descriptors:
+        return 0
+
+    # MySQL doesn't allow selecting from the table that is being updated in a sub-query.
+    if not connections[queryset.db].features.update_can_self_select:
+        return _refresh_with_bulk_update(queryset, descriptors)
+
+    values: dict[str, Any] = {}
+    for descriptor in descriptors:
+        # Use the expression of the lookup property, since `L(...)` reads the persisted value.
+        # The expression is evaluated in a sub-query, since UPDATE queries cannot contain joins.
+        value = (
+            queryset.model._base_manager.filter(pk=models.OuterRef("pk"))
+            .values("pk")  # Group by the primary key if the expression contains aggregates.
+            .annotate(value=descriptor.inlined_expression)
+            .values("value")[:1]
+        )
+        values[descriptor.column_name] = models.Subquery(value)  # type: ignore[index]
+
+    return queryset.update(**values)
+
+
+def _refresh_with_bulk_update(queryset: models.QuerySet, descriptors: list[LookupPropertyDescriptor]) -> int:
+    """Fetch the recalculated values of the persisted lookup properties first, and save them with `bulk_update`."""
+    aliases = {f"value_{i}": descriptor for i, descriptor in enumerate(descriptors)}
+    rows = (
+        queryset.order_by()  # Ordering would be added to the GROUP BY clause.
+        .values("pk")  # Group by the primary key if the expression contains aggregates.
+        .annotate(**{alias: descriptor.inlined_expression for alias, descriptor in aliases.items()})
+    )
+    instances = [
+        queryset.model(pk=row["pk"], **{descriptor.column_name: row[alias] for alias, descriptor in aliases.items()})
+        for row in rows
+    ]
+    if not instances:
+        return 0
+
+    fields = [descriptor.column_name for descriptor in descriptors]
+    return queryset.model._base_manager.bulk_update(instances, fields=fields)  # type: ignore[arg-type]
+
+
+def persisted_lookup_properties(model: type[models.Model], *names: str) -> list[LookupPropertyDescriptor]:
+    """Get the persisted lookup properties with the given names, or all persisted lookup properties of the model."""
+    if not names:
+        return [
+            value
+            for value in vars(model).values()
+            if isinstance(value, LookupPropertyDescriptor) and value.state.persist
+        ]
+
+    descriptors: list[LookupPropertyDescriptor] = []
+    for name in names:
+        descriptor = getattr(model, name, None)
+        if not isinstance(descriptor, LookupPropertyDescriptor) or not descriptor.state.persist:
+            msg = f"'{name}' is not a persisted lookup property on model '{model.__name__}'."
+            raise ValueError(msg)
+        descriptors.append(descriptor)
+    return descriptors
@@ -2,6 +2,7 @@
 
 import random
 import string
+import warnings
 from collections.abc import Callable, Collection, Generator, Iterable
 from dataclasses import dataclass, field
 from types import FunctionType
@@ -29,6 +30,8 @@
 
 __all__ = [
     "LOOKUP_PREFIX",
+    "MATERIALIZED_PREFIX",
+    "PERSISTED_PREFIX",
     "Any",
     "Callable",
     "Collection",
@@ -57,6 +60,8 @@
 Expr: TypeAlias = BaseExpression | Combinable | models.Q
 
 LOOKUP_PREFIX = "_lookup_property_"
+MATERIALIZED_PREFIX = "_materialized_"
+PERSISTED_PREFIX = "_persisted_"
 
 
 class ExpressionKind(Protocol):
@@ -84,7 +89,11 @@ class RandomKeyDict(dict[str, Any]):
     """Custom dict for adding items with random keys."""
 
     def add(self, item: Any) -> str:
-        """Add an item to the dict with a random key. Return the key."""
+        """Add an item to the dict with a random key. Return the key. The same item is only added once."""
+        for name, value in self.items():
+            if value is item:
+                return name
+
         name = random_arg_name()
         self.__setitem__(name, item)
         return name
@@ -95,16 +104,40 @@ class State:
     joins: list[str] = field(default_factory=list)
     use_tz: bool = field(default_factory=lambda: settings.USE_TZ)
     skip_codegen: bool = False
+    lazy_codegen: bool = field(default_factory=lambda: getattr(settings, "LOOKUP_PROPERTY_LAZY_CODEGEN", False))
+    optimize: bool = field(default_factory=lambda: getattr(settings, "LOOKUP_PROPERTY_OPTIMIZE", True))
+    strict_relations: Literal["raise", "warn"] | None = field(
+        default_factory=lambda: getattr(settings, "LOOKUP_PROPERTY_STRICT_RELATIONS", None),
+    )
+    cache: bool = False
+    materialize: Literal["stored", "virtual"] | None = None
+    persist: bool = False
+    index: bool = False
     concrete: bool = False
     hidden: bool = True
 
     imports: set[str] = field(default_factory=set, init=False)
-    extra_kwargs: RandomKeyDict = field(default_factory=RandomKeyDict, init=False)
+    extra_globals: RandomKeyDict = field(default_factory=RandomKeyDict, init=False)
+    model: type[models.Model] | None = field(default=None, init=False)
+
+    @property
+    def extra_kwargs(self) -> RandomKeyDict:
+        """Deprecated alias for `extra_globals`."""
+        msg = "`State.extra_kwargs` is deprecated, use `State.extra_globals` instead."
+        warnings.warn(msg, DeprecationWarning, stacklevel=2)
+        return self.extra_globals
 
 
 class StateArgs(TypedDict, total=False):
     joins: list[str]
     skip_codegen: bool
+    lazy_codegen: bool
+    optimize: bool
+    strict_relations: Literal["raise", "warn"] | None
     use_tz: bool
+    cache: bool
+    materialize: Literal["stored", "virtual"] | None
+    persist: bool
+    index: bool
     concrete: bool
     hidden: bool
@@ -1,5 +1,8 @@
 import pytest
 
+from example_project.example.models import Example
+from lookup_property import L
+
 from tests.factories import AlienFactory, ExampleFactory, PartFactory, TotalFactory
 
 pytestmark = [
@@ -10,15 +13,19 @@
 def test_lookup_property__count_field():
     example = ExampleFactory.create()
     assert example.count_field == 1
+    # Aggregates are calculated per instance, like when annotated.
     ExampleFactory.create()
-    assert example.count_field == 2
+    assert example.count_field == 1
 
 
 def test_lookup_property__count_field_filter():
     example = ExampleFactory.create(number=11)
     assert example.count_field_filter == 0
     ExampleFactory.create(number=9)
-    assert example.count_field_filter == 1
+    assert example.count_field_filter == 0
+
+    other = ExampleFactory.create(number=9)
+    assert other.count_field_filter == 1
 
 
 def test_lookup_property__count_rel():
@@ -51,7 +58,7 @@ def test_lookup_property__max():
     example = ExampleFactory.create(number=1)
     assert example.max_ == 1
     ExampleFactory.create(number=3)
-    assert example.max_ == 3
+    assert example.max_ == 1
 
 
 def test_lookup_property__max_rel():
@@ -81,7 +88,7 @@ def test_lookup_property__sum():
     example = ExampleFactory.create(number=1)
     assert example.sum_ == 1
     ExampleFactory.create(number=3)
-    assert example.sum_ == 4
+    assert example.sum_ == 1
 
 
 def test_lookup_property__sum_rel():
@@ -90,6 +97,9 @@ def test_lookup_property__sum_rel():
     assert example.sum_rel == 1
     TotalFactory.create(example=example, number=4)
     assert example.sum_rel == 5
+    # Related objects of other instances are not included.
+    TotalFactory.create(number=10)
+    assert example.sum_rel == 5
 
 
 def test_lookup_property__sum_filter():
@@ -103,18 +113,44 @@ def test_lookup_property__avg():
     example = ExampleFactory.create(number=1)
     assert example.avg == 1.0
     ExampleFactory.create(number=3)
-    assert example.avg == 2.0
+    assert example.avg == 1.0
 
 
 def test_lookup_property__std_dev():
     example = ExampleFactory.create(number=1)
     assert example.std_dev == 0.0
     ExampleFactory.create(number=3)
-    assert example.std_dev == 1.0
+    assert example.std_dev == 0.0
 
 
 def test_lookup_property__variance():
     example = ExampleFactory.create(number=1)
     assert example.variance == 0.0
     ExampleFactory.create(number=3)
-    assert example.variance == 1.0
+    assert example.variance == 0.0
+
+
+def test_lookup_property__aggregate__annotate_matches_python():
+    example_1 = ExampleFactory.create(number=1)
+    example_2 = ExampleFactory.create(number=2)
+    TotalFactory.create(example=example_1, number=1)
+    TotalFactory.create(example=example_1, number=3)
+    TotalFactory.create(example=example_2, number=5)
+
+    for example in Example.objects.filter(pk__in=[example_1.pk, example_2.pk]).annotate(value=L("sum_rel")):
+        assert example.value == Example.objects.get(pk=example.pk).sum_rel
+
+
+def test_lookup_property__aggregate__evaluate_many(query_counter):
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1, number=1)
+    TotalFactory.create(example=example_1, number=3)
+    TotalFactory.create(example=example_2, number=5)
+
+    examples = list(Example.objects.filter(pk__in=[example_1.pk, example_2.pk]).order_by("pk"))
+
+    query_counter.clear()
+    assert Example.sum_rel.evaluate_many(examples) == [4, 5]
+    assert [example.sum_rel for example in examples] == [4, 5]
+    assert len(query_counter) == 1
@@ -0,0 +1,107 @@
+import datetime
+from types import FunctionType, SimpleNamespace
+from unittest.mock import patch
+
+from django.db import models
+from django.db.models import functions
+
+from lookup_property.field import LookupPropertyDescriptor
+
+
+def full_name():
+    return functions.Concat(
+        models.F("first_name"),
+        models.Value(" "),
+        models.F("last_name"),
+        output_field=models.CharField(),
+    )
+
+
+def after_date():
+    return models.Q(timestamp__gt=datetime.date(2022, 1, 1))
+
+
+def test_bytecode_cache__disabled(tmp_path):
+    assert LookupPropertyDescriptor(full_name).func_source is not None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bytecode_cache__write_and_read(settings, tmp_path):
+    settings.LOOKUP_PROPERTY_BYTECODE_CACHE = str(tmp_path)
+
+    descriptor = LookupPropertyDescriptor(full_name)
+    assert descriptor.func_source is not None
+    assert len(list(tmp_path.iterdir())) == 1
+
+    with patch("lookup_property.field.query_expression_ast_module") as mock:
+        cached = LookupPropertyDescriptor(full_name)
+        assert cached.func_source is not None
+
+    assert mock.call_count == 0
+    assert cached.func_source == descriptor.func_source
+    assert cached.module is not None
+
+    instance = SimpleNamespace(first_name="foo", last_name="bar")
+    assert cached.func(instance) == "foo bar"
+
+
+def test_bytecode_cache__key_includes_state(settings, tmp_path):
+    settings.LOOKUP_PROPERTY_BYTECODE_CACHE = str(tmp_path)
+
+    for kwargs in ({}, {"use_tz": False}, {"use_tz": True}):
+        assert LookupPropertyDescriptor(full_name, **kwargs).func_source is not None
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_bytecode_cache__captured_values_not_cached(settings, tmp_path):
+    settings.LOOKUP_PROPERTY_BYTECODE_CACHE = str(tmp_path)
+
+    descriptor = LookupPropertyDescriptor(after_date)
+    assert descriptor.func_source is not None
+    assert list(tmp_path.iterdir()) == []
+
+    instance = SimpleNamespace(timestamp=datetime.date(2022, 1, 2))
+    assert descriptor.func(instance) is True
+
+
+def test_bytecode_cache__invalid_file(settings, tmp_path):
+    settings.LOOKUP_PROPERTY_BYTECODE_CACHE = str(tmp_path)
+
+    assert LookupPropertyDescriptor(full_name).func_source is not None
+    path = next(tmp_path.iterdir())
+    path.write_bytes(b"invalid")
+
+    descriptor = LookupPropertyDescriptor(full_name)
+
+    instance = SimpleNamespace(first_name="foo", last_name="bar")
+    assert descriptor.func(instance) == "foo bar"
+
+
+def inner_upper():
+    return functions.Upper("name", output_field=models.CharField())
+
+
+def inner_lower():
+    return functions.Lower("name", output_field=models.CharField())
+
+
+def outer():
+    return models.F("inner")
+
+
+def test_bytecode_cache__key_includes_inlined_lookup_properties(settings, tmp_path):
+    settings.LOOKUP_PROPERTY_BYTECODE_CACHE = str(tmp_path)
+
+    def generate(inner: FunctionType) -> LookupPropertyDescriptor:
+        class Model:
+            pass
+
+        Model.inner = LookupPropertyDescriptor(inner)
+        Model.outer = LookupPropertyDescriptor(outer)
+        Model.outer.field = SimpleNamespace(model=Model, attname="_lookup_property_outer")
+        return Model.outer
+
+    instance = SimpleNamespace(name="Foo")
+    assert generate(inner_upper).func(instance) == "FOO"
+    # The inlined lookup property has changed, so the cached function is not used.
+    assert generate(inner_lower).func(instance) == "foo"
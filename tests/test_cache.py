@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+
+from example_project.example.models import Example
+from lookup_property import L
+from tests.factories import ExampleFactory, TotalFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def test_lookup_property__cache():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+
+    with patch.object(Example.cached_full_name, "func", wraps=Example.cached_full_name.func) as func:
+        assert example.cached_full_name == "foo bar"
+        assert example.cached_full_name == "foo bar"
+
+    assert func.call_count == 1
+
+
+def test_lookup_property__cache__not_cached_by_default():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+
+    with patch.object(Example.full_name, "func", wraps=Example.full_name.func) as func:
+        assert example.full_name == "foo bar"
+        assert example.full_name == "foo bar"
+
+    assert func.call_count == 2
+
+
+def test_lookup_property__cache__invalidated_on_assignment():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+    assert example.cached_full_name == "foo bar"
+
+    example.first_name = "fizz"
+    assert example.cached_full_name == "fizz bar"
+
+
+def test_lookup_property__cache__invalidated_on_assignment__same_value():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+    assert example.cached_full_name == "foo bar"
+
+    with patch.object(Example.cached_full_name, "func", wraps=Example.cached_full_name.func) as func:
+        example.last_name = "".join(["b", "ar"])
+        assert example.cached_full_name == "foo bar"
+
+    assert func.call_count == 1
+
+
+def test_lookup_property__cache__cleared_on_refresh_from_db(query_counter):
+    example = ExampleFactory.create()
+    assert example.cached_count_rel == 0
+
+    TotalFactory.create(example=example)
+    assert example.cached_count_rel == 0
+
+    example.refresh_from_db()
+    query_counter.clear()
+
+    assert example.cached_count_rel == 1
+    assert example.cached_count_rel == 1
+    assert len(query_counter) == 1
+
+
+def test_lookup_property__cache__annotated():
+    ExampleFactory.create(first_name="foo", last_name="bar")
+    example = Example.objects.annotate(cached_full_name=L("cached_full_name")).first()
+
+    with patch.object(Example.cached_full_name, "func", wraps=Example.cached_full_name.func) as func:
+        assert example.cached_full_name == "foo bar"
+        example.first_name = "fizz"
+        assert example.cached_full_name == "foo bar"
+
+    assert func.call_count == 0
+
+
+def test_lookup_property__cache__clear_cache():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+    assert example.cached_full_name == "foo bar"
+
+    with patch.object(Example.cached_full_name, "func", wraps=Example.cached_full_name.func) as func:
+        Example.cached_full_name.clear_cache(example)
+        assert example.cached_full_name == "foo bar"
+
+    assert func.call_count == 1
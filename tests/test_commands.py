@@ -0,0 +1,90 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from example_project.example.models import Example
+from lookup_property import L
+from tests.factories import ExampleFactory, TotalFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def create_examples() -> list[Example]:
+    examples = ExampleFactory.create_batch(3)
+    for i, example in enumerate(examples):
+        TotalFactory.create_batch(i + 1, example=example)
+    return examples
+
+
+def persisted_values() -> list[int]:
+    return list(Example.objects.order_by("pk").values_list(L("persisted_count_rel"), flat=True))
+
+
+def test_refresh_lookup_properties_command(capsys):
+    examples = create_examples()
+    assert persisted_values() == [0, 0, 0]
+
+    call_command("refresh_lookup_properties", "example.Example", "--chunk-size", "2")
+
+    assert persisted_values() == [1, 2, 3]
+
+    output = capsys.readouterr().out.splitlines()
+    assert output == [
+        f"Refreshed 2/3 rows of 'example.Example' (last primary key: {examples[1].pk}).",
+        f"Refreshed 3/3 rows of 'example.Example' (last primary key: {examples[2].pk}).",
+        "Refreshed 3 rows of 'example.Example'.",
+    ]
+
+
+def test_refresh_lookup_properties_command__python(capsys):
+    examples = create_examples()
+
+    call_command("refresh_lookup_properties", "example.Example", "persisted_count_rel", "--python", "--chunk-size=2")
+
+    assert persisted_values() == [1, 2, 3]
+
+    output = capsys.readouterr().out.splitlines()
+    assert output == [
+        f"Refreshed 2/3 rows of 'example.Example' (last primary key: {examples[1].pk}).",
+        f"Refreshed 3/3 rows of 'example.Example' (last primary key: {examples[2].pk}).",
+        "Refreshed 3 rows of 'example.Example'.",
+    ]
+
+
+def test_refresh_lookup_properties_command__python__function(monkeypatch):
+    create_examples()
+
+    # The values are calculated with the python function of the lookup property, not in the database.
+    monkeypatch.setattr(Example.persisted_count_rel, "func", lambda instance: instance.pk * 10)
+    call_command("refresh_lookup_properties", "example.Example", "--python")
+
+    assert persisted_values() == [pk * 10 for pk in Example.objects.order_by("pk").values_list("pk", flat=True)]
+
+
+def test_refresh_lookup_properties_command__start_after(capsys):
+    examples = create_examples()
+
+    call_command("refresh_lookup_properties", "example.Example", "--start-after", str(examples[0].pk))
+
+    assert persisted_values() == [0, 2, 3]
+
+    output = capsys.readouterr().out.splitlines()
+    assert output[-1] == "Refreshed 2 rows of 'example.Example'."
+
+
+def test_refresh_lookup_properties_command__not_persisted():
+    msg = "'full_name' is not a persisted lookup property on model 'Example'."
+    with pytest.raises(CommandError, match=msg):
+        call_command("refresh_lookup_properties", "example.Example", "full_name")
+
+
+def test_refresh_lookup_properties_command__no_persisted_properties():
+    msg = "Model 'example.Total' has no persisted lookup properties."
+    with pytest.raises(CommandError, match=msg):
+        call_command("refresh_lookup_properties", "example.Total")
+
+
+def test_refresh_lookup_properties_command__unknown_model():
+    with pytest.raises(CommandError):
+        call_command("refresh_lookup_properties", "example.Foo")
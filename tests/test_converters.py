@@ -1,10 +1,14 @@
+import ast
+import datetime
 import re
 
 import pytest
 from django.db import models
 from django.db.models.functions import Extract, Trunc
+from django.test.utils import isolate_apps
 
-from lookup_property import expression_to_ast
+from example_project.example.models import Example
+from lookup_property import expression_to_ast, lookup_property
 from lookup_property.converters import convert_django_field
 from lookup_property.typing import State
 
@@ -28,3 +32,74 @@ def test_expression_to_ast__extract__unknown():
     msg = re.escape("No implementation for extract expression 'foo'.")
     with pytest.raises(ValueError, match=msg):
         expression_to_ast(Extract("unknown", "foo"), state=State())
+
+
+def test_expression_to_ast__iregex__precompiled():
+    state = State()
+    expression_to_ast(models.Q(name__iregex="foo"), state)
+
+    (pattern,) = state.extra_globals.values()
+    assert pattern.pattern == "foo"
+    assert pattern.flags & re.IGNORECASE
+
+
+def test_expression_to_ast__in__constants():
+    state = State()
+    state.model = Example
+    comparison = expression_to_ast(models.Q(first_name__in=["foo", "bar", 1, None]), state)
+
+    assert ast.unparse(comparison) == "self.first_name in {'foo', 'bar', 1, None}"
+    assert not state.extra_globals
+
+
+def test_expression_to_ast__in__hashable():
+    state = State()
+    state.model = Example
+    values = [datetime.date(2022, 1, 1), datetime.date(2022, 1, 2)]
+    expression_to_ast(models.Q(timestamp__in=values), state)
+
+    (value,) = state.extra_globals.values()
+    assert value == frozenset(values)
+
+
+def test_expression_to_ast__in__unhashable():
+    state = State()
+    state.model = Example
+    comparison = expression_to_ast(models.Q(first_name__in=[["foo"], ["bar"]]), state)
+
+    assert ast.unparse(comparison) == "self.first_name in [['foo'], ['bar']]"
+
+
+def test_expression_to_ast__in__unknown_field():
+    # Without a model, the field is not known to hold hashable values.
+    state = State()
+    comparison = expression_to_ast(models.Q(name__in=["foo", "bar"]), state)
+
+    assert ast.unparse(comparison) == "self.name in ['foo', 'bar']"
+
+
+@isolate_apps("example_project.example")
+def test_expression_to_ast__in__json_field():
+    class Model(models.Model):
+        data = models.JSONField()
+
+        class Meta:
+            app_label = "example"
+
+        @lookup_property
+        def data_in() -> bool:
+            return models.Q(data__in=["foo", 1])  # type: ignore[return-value]
+
+    # Lists and dicts in JSON fields are not hashable, so they cannot be checked against a set.
+    assert Model.data_in.func_source == "def data_in(self):\n    return self.data in ['foo', 1]"
+    assert Model(data="foo").data_in is True
+    assert Model(data=["foo"]).data_in is False
+    assert Model(data={"foo": 1}).data_in is False
+
+
+def test_state__extra_kwargs__deprecated():
+    state = State()
+
+    msg = re.escape("`State.extra_kwargs` is deprecated, use `State.extra_globals` instead.")
+    with pytest.warns(DeprecationWarning, match=msg):
+        assert state.extra_kwargs is state.extra_globals
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from django.db import models
+from django.db.models import functions
+
+from example_project.example.models import Example
+from lookup_property import L
+from lookup_property.dependencies import inline_lookup_properties, lookup_property_graph
+from lookup_property.field import LookupPropertyDescriptor
+
+
+def test_lookup_property_graph():
+    assert lookup_property_graph(Example, "name") == {"name": {"full_name"}, "full_name": set()}
+    assert lookup_property_graph(Example, "full_name") == {"full_name": set()}
+
+
+def test_lookup_property_graph__not_inlined():
+    # Overridden lookup properties are not inlined.
+    assert lookup_property_graph(Example, "refs_another_lookup") == {"refs_another_lookup": set()}
+
+
+@pytest.mark.parametrize("kwargs", [{"persist": True}, {"materialize": "stored"}, {"materialize": "virtual"}])
+def test_inline_lookup_properties__column_not_inlined(kwargs):
+    class Model:
+        first = LookupPropertyDescriptor(lambda: models.F("number") + 1, **kwargs)
+        second = LookupPropertyDescriptor(lambda: models.F("first") + 1)
+
+    assert lookup_property_graph(Model, "second") == {"second": set()}
+    assert inline_lookup_properties(Model, "second") is Model.second.expression
+
+
+def test_inline_lookup_properties():
+    expression = inline_lookup_properties(Example, "name")
+    assert expression is Example.full_name.expression
+
+
+def test_inline_lookup_properties__original_not_modified():
+    class Model:
+        first = LookupPropertyDescriptor(lambda: models.F("number") + 1)
+        second = LookupPropertyDescriptor(lambda: functions.Upper(L("first")) + models.F("first"))
+
+    original = Model.second.expression
+    expression = inline_lookup_properties(Model, "second")
+
+    assert expression is not original
+    assert expression.lhs.source_expressions == [Model.first.expression]
+    assert expression.rhs is Model.first.expression
+    assert isinstance(original.lhs.source_expressions[0], L)
+    assert isinstance(original.rhs, models.F)
+
+
+def test_inline_lookup_properties__q():
+    class Model:
+        first = LookupPropertyDescriptor(lambda: models.F("number") + 1)
+        second = LookupPropertyDescriptor(lambda: models.Q(number=models.F("first")) | models.Q(L(first=1)))
+
+    expression = inline_lookup_properties(Model, "second")
+    assert expression.children[0] == ("number", Model.first.expression)
+    # References with lookups are resolved separately.
+    assert expression.children[1] is Model.second.expression.children[1]
+
+
+def test_inline_lookup_properties__cycle():
+    class Model:
+        first = LookupPropertyDescriptor(lambda: models.F("second"))
+        second = LookupPropertyDescriptor(lambda: models.F("third"))
+        third = LookupPropertyDescriptor(lambda: models.F("first"))
+
+    msg = re.escape("Lookup properties on model 'Model' reference each other in a cycle:")
+    with pytest.raises(ValueError, match=msg):
+        inline_lookup_properties(Model, "first")
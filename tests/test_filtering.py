@@ -4,6 +4,7 @@
 
 from example_project.example.models import Example, Far, Other, Part, Thing, Total
 from lookup_property import L
+from lookup_property.expressions import find_lookup_property_expression
 from tests.factories import (
     AlienFactory,
     ExampleFactory,
@@ -264,6 +265,13 @@ def test_filter_by_lookup_property__exists_property__from_related_model():
     assert Total.objects.filter(L(example__exists=False)).count() == 0
 
 
+def test_filter_by_lookup_property__f_ref_to_another_lookup():
+    ExampleFactory.create(first_name="foo", last_name="bar")
+
+    assert Example.objects.filter(L(name="foo bar")).count() == 1
+    assert Example.objects.filter(L(name="fizz buzz")).count() == 0
+
+
 def test_filter_by_lookup_property__refs_another_lookup():
     ExampleFactory.create(parts__far__number=1)
 
@@ -379,3 +387,22 @@ def test_filter_by_lookup_property__annotations_with_same_name_from_other_models
     # Filtering with a different lookup property from a different model
     # with the same name should also work, and should use the correct property.
     assert qs.filter(L(other__number_in_range=True)).count() == 1
+
+
+def test_filter_by_lookup_property__expression_is_cached():
+    example = ExampleFactory.create(parts__far__number=1)
+    far = Far.objects.first()
+    find_lookup_property_expression.cache_clear()
+
+    query_1 = str(Far.objects.filter(L(parts__examples__case_6="foo")).query)
+    assert find_lookup_property_expression.cache_info().misses == 1
+
+    query_2 = str(Far.objects.filter(L(parts__examples__case_6="foo")).query)
+    assert find_lookup_property_expression.cache_info().hits == 1
+    assert query_1 == query_2
+
+    # The cached expression is not modified when it's used in a query.
+    assert Far.objects.filter(L(parts__examples__case_6="foo")).first() == far
+    assert Far.objects.filter(L(parts__examples__case_6="bar")).first() is None
+    assert Far.objects.filter(L(parts__examples__case_6="foo")).first() == far
+    assert Example.objects.filter(L(case_6="foo")).first() == example
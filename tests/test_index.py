@@ -0,0 +1,43 @@
+import re
+
+import pytest
+from django.db import connection, models
+
+from example_project.example.models import Example
+from lookup_property import L
+from lookup_property.field import LookupPropertyDescriptor
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def get_index(name: str) -> models.Index:
+    return next(index for index in Example._meta.indexes if index.name == name)
+
+
+def test_lookup_property__index():
+    index = get_index("example_exa_upper_327ef7_idx")
+    assert index.expressions == (Example.upper.expression,)
+
+
+def test_lookup_property__index__materialized():
+    index = get_index("example_exa_materia_d5e14d_idx")
+    assert index.fields == ["_materialized_materialized_full_name"]
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="Query plan format is database specific.")
+def test_lookup_property__index__used_in_filter():
+    queryset = Example.objects.filter(L(upper="FOO"))
+    assert "USING INDEX example_exa_upper_327ef7_idx" in queryset.explain()
+
+    queryset = Example.objects.filter(L(materialized_full_name="foo bar"))
+    assert "USING INDEX example_exa_materia_d5e14d_idx" in queryset.explain()
+
+
+def test_lookup_property__index__joins():
+    descriptor = LookupPropertyDescriptor(lambda: models.F("number") + 1, index=True, joins=["other"])
+
+    msg = re.escape("Lookup property '<lambda>' cannot be indexed, since it uses joins or aggregates.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._check_database_expression("indexed")
@@ -0,0 +1,68 @@
+import pytest
+
+from example_project.example.models import Example
+from lookup_property import L, lookup_property_evaluated, track_lookup_properties
+from tests.factories import ExampleFactory, TotalFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def test_track_lookup_properties():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+    TotalFactory.create(example=example)
+    example = Example.objects.annotate(full_name=L("full_name")).get(pk=example.pk)
+
+    with track_lookup_properties() as stats:
+        assert example.full_name == "foo bar"
+        assert example.count_rel == 1
+        assert example.count_rel == 1
+
+    assert list(stats) == ["example.Example.full_name", "example.Example.count_rel"]
+
+    full_name = stats["example.Example.full_name"]
+    assert full_name.calls == 1
+    assert full_name.hits == 1
+    assert full_name.hit_rate == 1.0
+    assert full_name.queries == 0
+    assert full_name.time == 0.0
+
+    count_rel = stats["example.Example.count_rel"]
+    assert count_rel.calls == 2
+    assert count_rel.hits == 0
+    assert count_rel.hit_rate == 0.0
+    assert count_rel.queries == 2
+    assert count_rel.time > 0.0
+
+
+def test_track_lookup_properties__disconnect():
+    example = ExampleFactory.create()
+
+    with track_lookup_properties() as stats:
+        pass
+
+    assert example.full_name is not None
+    assert stats == {}
+    assert not lookup_property_evaluated.receivers
+
+
+def test_lookup_property_evaluated():
+    example = ExampleFactory.create(first_name="foo", last_name="bar")
+    calls = []
+
+    def receiver(**kwargs):
+        calls.append(kwargs)
+
+    lookup_property_evaluated.connect(receiver)
+    try:
+        assert example.full_name == "foo bar"
+    finally:
+        lookup_property_evaluated.disconnect(receiver)
+
+    assert len(calls) == 1
+    assert calls[0]["sender"] is Example
+    assert calls[0]["instance"] is example
+    assert calls[0]["name"] == "full_name"
+    assert calls[0]["cached"] is False
+    assert calls[0]["queries"] == 0
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+from inspect import cleandoc
+from unittest.mock import patch
+
+import pytest
+from django.db import models
+from django.db.models import functions
+
+from example_project.example.models import Example
+from lookup_property.field import LookupPropertyDescriptor
+from lookup_property.typing import State
+from tests.factories import ExampleFactory
+
+
+def full_name():
+    return functions.Concat(
+        models.F("first_name"),
+        models.Value(" "),
+        models.F("last_name"),
+        output_field=models.CharField(),
+    )
+
+
+def test_lazy_codegen__not_generated_on_init():
+    with patch("lookup_property.field.query_expression_ast_module") as mock:
+        descriptor = LookupPropertyDescriptor(full_name, lazy_codegen=True)
+
+    assert mock.call_count == 0
+    assert "module" not in descriptor.__dict__
+    assert "expression" not in descriptor.__dict__
+
+
+def test_lazy_codegen__func_source():
+    descriptor = LookupPropertyDescriptor(full_name, lazy_codegen=True)
+    assert descriptor.func_source == cleandoc(
+        """
+        def full_name(self):
+            return self.first_name + (' ' + self.last_name)
+        """,
+    )
+
+
+@pytest.mark.django_db
+def test_lazy_codegen__generated_on_first_access():
+    example = ExampleFactory.create()
+    assert example.lazy_full_name == "foo bar"
+    assert example.lazy_full_name == "foo bar"
+    assert Example.lazy_full_name.func_source == Example.full_name.func_source.replace("full_name", "lazy_full_name")
+
+
+def test_lazy_codegen__generated_once():
+    descriptor = LookupPropertyDescriptor(full_name, lazy_codegen=True)
+    instance = Example(first_name="foo", last_name="bar")
+
+    with patch.object(descriptor, "_generate", wraps=descriptor._generate) as mock:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: descriptor.func(instance), range(32)))
+
+    assert mock.call_count == 1
+    assert results == ["foo bar"] * 32
+
+
+def test_lazy_codegen__setting(settings):
+    settings.LOOKUP_PROPERTY_LAZY_CODEGEN = True
+    assert State().lazy_codegen is True
+    assert State(lazy_codegen=False).lazy_codegen is False
@@ -128,6 +128,14 @@ def test_lookup_property__q_iregex():
     assert example.q_iregex is True
 
 
+def test_lookup_property__q_iregex_field():
+    example = ExampleFactory.create(first_name="Foo", last_name="fo+")
+    assert example.q_iregex_field is True
+
+    example.last_name = "bar"
+    assert example.q_iregex_field is False
+
+
 def test_lookup_property__q_or():
     example = ExampleFactory.create()
     assert example.q_or is True
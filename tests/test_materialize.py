@@ -0,0 +1,116 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+from django.db import models
+from django.db.models import functions
+
+from example_project.example.models import Example
+from lookup_property import L
+from lookup_property.field import LookupPropertyDescriptor
+from tests.factories import ExampleFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def test_lookup_property__materialize__field():
+    stored = Example._meta.get_field("_materialized_materialized_full_name")
+    assert isinstance(stored, models.GeneratedField)
+    assert stored.db_persist is True
+    assert isinstance(stored.output_field, models.CharField)
+
+    virtual = Example._meta.get_field("_materialized_materialized_upper")
+    assert isinstance(virtual, models.GeneratedField)
+    assert virtual.db_persist is False
+
+
+def test_lookup_property__materialize__filter():
+    ExampleFactory.create(first_name="foo", last_name="bar")
+
+    queryset = Example.objects.filter(L(materialized_full_name="foo bar"))
+    assert queryset.count() == 1
+    assert Example.objects.filter(L(materialized_full_name="fizz buzz")).count() == 0
+
+    # The generated column is used instead of the expression.
+    sql = str(queryset.query)
+    assert 'WHERE "example_example"."_materialized_materialized_full_name" = foo bar' in sql
+
+
+def test_lookup_property__materialize__annotate():
+    ExampleFactory.create(first_name="foo", last_name="bar")
+
+    assert list(Example.objects.values_list(L("materialized_upper"), flat=True)) == ["FOO"]
+
+
+def test_lookup_property__materialize__python():
+    example = Example(first_name="foo", last_name="bar")
+    assert example.materialized_full_name == "foo bar"
+    assert example.materialized_upper == "FOO"
+
+
+def test_lookup_property__materialize__no_output_field():
+    descriptor = LookupPropertyDescriptor(lambda: models.F("first_name"), materialize="stored")
+
+    msg = re.escape("Materialized lookup property '<lambda>' must have an explicit output field.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._materialized_field()
+
+
+def test_lookup_property__materialize__joins():
+    def thing_name():
+        return models.F("thing__name")
+
+    descriptor = LookupPropertyDescriptor(thing_name, materialize="stored", joins=["thing"])
+
+    msg = re.escape("Lookup property 'thing_name' cannot be materialized, since it uses joins or aggregates.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._check_database_expression("materialized")
+
+
+def test_lookup_property__materialize__references_other_lookup_property():
+    def upper_name():
+        return functions.Upper(models.F("full_name"), output_field=models.CharField())
+
+    class Model:
+        full_name = Example.full_name
+
+    Model.upper_name = LookupPropertyDescriptor(upper_name, materialize="virtual")
+
+    Model.upper_name.field = SimpleNamespace(model=Model, attname="_lookup_property_upper_name")
+
+    msg = re.escape("Lookup property 'upper_name' cannot be materialized, since it references other lookup properties.")
+    with pytest.raises(ValueError, match=msg):
+        Model.upper_name._check_database_expression("materialized")
+
+
+def test_lookup_property__materialize__invalid_value():
+    def upper_name():
+        return functions.Upper(models.F("first_name"), output_field=models.CharField())
+
+    msg = re.escape("Lookup property 'upper_name' has an invalid `materialize` value 'virtaul'.")
+    with pytest.raises(ValueError, match=msg):
+        LookupPropertyDescriptor(upper_name, materialize="virtaul")
+
+
+def test_lookup_property__materialize__related_path():
+    def thing_name():
+        return functions.Upper(models.F("thing__name"), output_field=models.CharField())
+
+    descriptor = LookupPropertyDescriptor(thing_name, materialize="stored")
+
+    msg = re.escape("Lookup property 'thing_name' cannot be materialized, since it uses joins or aggregates.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._check_database_expression("materialized")
+
+
+def test_lookup_property__materialize__subquery():
+    def has_things():
+        return models.Exists(Example.objects.filter(pk=models.OuterRef("pk")))
+
+    descriptor = LookupPropertyDescriptor(has_things, materialize="stored")
+
+    msg = re.escape("Lookup property 'has_things' cannot be materialized, since it uses subqueries.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._check_database_expression("materialized")
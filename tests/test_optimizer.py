@@ -0,0 +1,218 @@
+import ast
+import datetime
+import itertools
+from inspect import cleandoc
+
+import pytest
+from django.db import models
+from django.db.models import aggregates, functions
+
+from lookup_property.converters.optimizer import eliminate_common_subexpressions, fold_constants
+from lookup_property.field import LookupPropertyDescriptor
+from example_project.example.models import Example
+from tests.factories import ExampleFactory, TotalFactory
+
+
+def optimize(source: str) -> str:
+    expression = ast.parse(source, mode="eval").body
+    names = (f"_v{i}" for i in itertools.count())
+    return ast.unparse(eliminate_common_subexpressions(expression, names))
+
+
+def fold(source: str) -> str:
+    return ast.unparse(fold_constants(ast.parse(source, mode="eval").body))
+
+
+def test_optimizer__repeated_attribute():
+    assert optimize("self.foo.bar + self.foo.bar") == "(_v0 := self.foo.bar) + _v0"
+
+
+def test_optimizer__largest_expression_first():
+    assert optimize("self.foo.bar.upper() + self.foo.bar.upper()") == "(_v0 := self.foo.bar.upper()) + _v0"
+
+
+def test_optimizer__nested_expressions():
+    assert optimize("f(self.foo.bar) + g(self.foo.bar) + f(self.foo.bar)") == (
+        "(_v0 := f((_v1 := self.foo.bar))) + g(_v1) + _v0"
+    )
+
+
+def test_optimizer__if_expression__test_evaluated_first():
+    assert optimize("self.foo if self.foo is not None else None") == "_v0 if (_v0 := self.foo) is not None else None"
+
+
+def test_optimizer__if_expression__different_branches():
+    assert optimize("self.foo if x else self.foo") == "self.foo if x else self.foo"
+
+
+def test_optimizer__if_expression__branch_before_outside():
+    assert optimize("(self.foo if x else 1) + self.foo") == "(self.foo if x else 1) + self.foo"
+
+
+def test_optimizer__if_expression__outside_before_branch():
+    assert optimize("self.foo + (self.foo if x else 1)") == "(_v0 := self.foo) + (_v0 if x else 1)"
+
+
+def test_optimizer__bool_op():
+    assert optimize("self.foo.bar and self.foo.bar > 1") == "(_v0 := self.foo.bar) and _v0 > 1"
+    assert optimize("x and self.foo.bar or self.foo.bar") == "x and self.foo.bar or self.foo.bar"
+
+
+def test_optimizer__chained_comparison():
+    assert optimize("self.foo < self.bar < self.foo.baz") == "(_v0 := self.foo) < self.bar < _v0.baz"
+    assert optimize("1 < x < self.foo < self.foo") == "1 < x < (_v0 := self.foo) < _v0"
+    assert optimize("1 < x < self.foo + self.foo") == "1 < x < (_v0 := self.foo) + _v0"
+
+
+def test_optimizer__impure_calls_not_optimized():
+    assert optimize("random.random() + random.random()") == "random.random() + random.random()"
+
+
+def test_optimizer__functions_not_optimized():
+    assert optimize("f(1) + f(2)") == "f(1) + f(2)"
+
+
+def test_optimizer__lambda_not_optimized():
+    assert optimize("(lambda: self.foo)() + self.foo") == "(lambda: self.foo)() + self.foo"
+
+
+def test_optimizer__source():
+    def nullif():
+        return functions.NullIf("first_name", "last_name")
+
+    descriptor = LookupPropertyDescriptor(nullif)
+    assert descriptor.func_source == cleandoc(
+        """
+        def nullif(self):
+            return None if (_v0 := self.first_name) == self.last_name else _v0
+        """,
+    )
+
+
+def test_optimizer__disabled():
+    def nullif():
+        return functions.NullIf("first_name", "last_name")
+
+    descriptor = LookupPropertyDescriptor(nullif, optimize=False)
+    assert descriptor.func_source == cleandoc(
+        """
+        def nullif(self):
+            return None if self.first_name == self.last_name else self.first_name
+        """,
+    )
+
+
+def test_optimizer__disabled__setting(settings):
+    settings.LOOKUP_PROPERTY_OPTIMIZE = False
+
+    def nullif():
+        return functions.NullIf("first_name", "last_name")
+
+    descriptor = LookupPropertyDescriptor(nullif)
+    assert descriptor.state.optimize is False
+
+
+@pytest.mark.django_db
+def test_optimizer__aggregate_evaluated_once(query_counter):
+    def max_total():
+        return functions.Coalesce(aggregates.Max("totals__number"), models.Value(0))
+
+    descriptor = LookupPropertyDescriptor(max_total)
+    example = ExampleFactory.create()
+    TotalFactory.create(example=example, number=3)
+
+    query_counter.clear()
+    assert descriptor.func(example) == 3
+    assert len(query_counter) == 1
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("1 + 2 * 3", "7"),
+        ("self.foo + (1 + 2)", "self.foo + 3"),
+        ("self.foo + 1 + 2", "self.foo + 1 + 2"),
+        ("'a' + ('b' + self.foo)", "'a' + ('b' + self.foo)"),
+        ("self.foo + ('a' + ('b' + 'c'))", "self.foo + 'abc'"),
+        ("-(1)", "-1"),
+        ("not True", "False"),
+        ("1 < 2 < 3", "True"),
+        ("1 < 3 < 2", "False"),
+        ("'.' != None", "True"),
+        ("'o' in 'foo'", "True"),
+        ("None is None", "True"),
+        ("1 is 1", "1 is 1"),
+        ("self.foo[2 - 1:2 + 1 - 1]", "self.foo[1:2]"),
+    ],
+)
+def test_optimizer__fold_constants(source, expected):
+    assert fold(source) == expected
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("self.foo if True else self.bar", "self.foo"),
+        ("self.foo if 1 > 2 else self.bar", "self.bar"),
+        ("self.foo if self.baz else self.bar if None else 1", "self.foo if self.baz else 1"),
+        ("True and self.foo", "self.foo"),
+        ("False and self.foo", "False"),
+        ("True or self.foo", "True"),
+        ("0 or self.foo or 1", "self.foo or 1"),
+        ("self.foo and True", "self.foo and True"),
+        ("True and 1", "1"),
+    ],
+)
+def test_optimizer__prune_branches(source, expected):
+    assert fold(source) == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "1 / 0",
+        "'a' * 100000",
+        "2 ** 1000",
+        "1 << 1000",
+        "(1, 2) + (3,)",
+        "'a' + 1",
+    ],
+)
+def test_optimizer__fold_constants__not_folded(source):
+    assert fold(source) == source
+
+
+def test_optimizer__fold_constants__result_too_large():
+    assert fold("(2 ** 100) ** 100") == "1267650600228229401496703205376 ** 100"
+
+
+def example_properties() -> list[str]:
+    properties: list[str] = []
+    for field in Example._meta.private_fields:
+        descriptor = field.target_property
+        # Skip properties that need the database or are non-deterministic.
+        if descriptor.state.skip_codegen or descriptor.state.joins:
+            continue
+        if any(name in descriptor.func_source for name in ("_base_manager", "random", "now(")):
+            continue
+        properties.append(descriptor.__name__)
+    return properties
+
+
+@pytest.mark.parametrize("name", example_properties())
+def test_optimizer__same_result_as_unoptimized(name):
+    descriptor: LookupPropertyDescriptor = getattr(Example, name)
+    unoptimized = LookupPropertyDescriptor(descriptor._expression, optimize=False)
+
+    instances = [
+        Example(first_name="foo", last_name="bar", age=20, number=4, timestamp=datetime.datetime(2024, 2, 29, 12)),
+        Example(first_name="", last_name=None, age=0, number=-1, timestamp=datetime.datetime(2023, 12, 31)),
+    ]
+    for instance in instances:
+        try:
+            expected = unoptimized.func(instance)
+        except Exception as error:  # noqa: BLE001
+            with pytest.raises(type(error)):
+                descriptor.func(instance)
+        else:
+            assert descriptor.func(instance) == expected
@@ -0,0 +1,166 @@
+import re
+
+import pytest
+from django.db import connection, models
+from django.db.models import functions
+from django.db.models.signals import post_save, pre_save
+from django.test.utils import isolate_apps
+
+from example_project.example.models import Example
+from lookup_property import L, lookup_property, refresh_lookup_properties
+from lookup_property.field import LookupPropertyDescriptor
+from tests.factories import ExampleFactory, TotalFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def test_lookup_property__persist__field():
+    field = Example._meta.get_field("_persisted_persisted_count_rel")
+    assert isinstance(field, models.IntegerField)
+    assert field.null is True
+    assert field.editable is False
+
+
+def test_lookup_property__persist__save():
+    example = ExampleFactory.create()
+    assert example._persisted_persisted_count_rel == 0
+
+    TotalFactory.create(example=example)
+    example.save()
+    assert example._persisted_persisted_count_rel == 1
+
+    example.refresh_from_db()
+    assert example._persisted_persisted_count_rel == 1
+
+
+def test_lookup_property__persist__save__update_fields():
+    example = ExampleFactory.create()
+    TotalFactory.create(example=example)
+
+    # The stored value is saved even if it's not included in `update_fields`.
+    example.save(update_fields=["first_name"])
+    example.refresh_from_db()
+    assert example._persisted_persisted_count_rel == 1
+
+
+def test_lookup_property__persist__filter():
+    example = ExampleFactory.create()
+    TotalFactory.create(example=example)
+    example.save()
+
+    queryset = Example.objects.filter(L(persisted_count_rel=1))
+    assert list(queryset) == [example]
+    assert Example.objects.filter(L(persisted_count_rel=0)).count() == 0
+
+    # The persisted column is used instead of the expression.
+    sql = str(queryset.query)
+    assert 'WHERE "example_example"."_persisted_persisted_count_rel" = 1' in sql
+
+
+def test_lookup_property__persist__refresh():
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1)
+    TotalFactory.create(example=example_2)
+    TotalFactory.create(example=example_2)
+
+    # Changes to related objects are not persisted until the lookup property is refreshed.
+    assert Example.objects.filter(L(persisted_count_rel=0)).count() == 2
+
+    assert refresh_lookup_properties(Example.objects.all()) == 2
+    assert list(Example.objects.order_by("pk").values_list(L("persisted_count_rel"), flat=True)) == [1, 2]
+
+
+def test_lookup_property__persist__refresh__queryset():
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1)
+    TotalFactory.create(example=example_2)
+
+    assert Example.objects.filter(pk=example_1.pk).refresh_lookup_properties("persisted_count_rel") == 1
+    assert list(Example.objects.order_by("pk").values_list(L("persisted_count_rel"), flat=True)) == [1, 0]
+
+
+def test_lookup_property__persist__refresh__no_self_select(monkeypatch):
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1)
+    TotalFactory.create(example=example_2)
+    TotalFactory.create(example=example_2)
+
+    # E.g. MySQL cannot select from the updated table in a sub-query, so the values are fetched first.
+    monkeypatch.setattr(connection.features, "update_can_self_select", False)
+    assert refresh_lookup_properties(Example.objects.all()) == 2
+    assert list(Example.objects.order_by("pk").values_list(L("persisted_count_rel"), flat=True)) == [1, 2]
+    assert refresh_lookup_properties(Example.objects.none()) == 0
+
+
+def test_lookup_property__persist__refresh__not_persisted():
+    msg = re.escape("'full_name' is not a persisted lookup property on model 'Example'.")
+    with pytest.raises(ValueError, match=msg):
+        refresh_lookup_properties(Example.objects.all(), "full_name")
+
+
+def test_lookup_property__persist__python():
+    example = ExampleFactory.create()
+    TotalFactory.create(example=example)
+
+    # The lookup property is still evaluated in python, even if the persisted value is stale.
+    assert example._persisted_persisted_count_rel == 0
+    assert example.persisted_count_rel == 1
+
+
+def test_lookup_property__persist__materialize():
+    def upper_name():
+        return functions.Upper(models.F("first_name"), output_field=models.CharField())
+
+    msg = re.escape("Lookup property 'upper_name' cannot be both materialized and persisted.")
+    with pytest.raises(ValueError, match=msg):
+        LookupPropertyDescriptor(upper_name, materialize="stored", persist=True)
+
+
+def test_lookup_property__persist__no_output_field():
+    descriptor = LookupPropertyDescriptor(lambda: models.F("first_name"), persist=True)
+
+    msg = re.escape("Persisted lookup property '<lambda>' must have an explicit output field.")
+    with pytest.raises(ValueError, match=msg):
+        descriptor._persisted_field()
+
+
+@isolate_apps("example_project.example")
+def test_lookup_property__persist__abstract_model():
+    class Base(models.Model):
+        name = models.CharField(max_length=256)
+
+        class Meta:
+            abstract = True
+            app_label = "example"
+
+        @lookup_property(persist=True, index=True)
+        def upper_name() -> str:
+            return functions.Upper(models.F("name"), output_field=models.CharField())  # type: ignore[return-value]
+
+    class First(Base):
+        pass
+
+    class Second(Base):
+        pass
+
+    # Each concrete model has its own copy of the lookup property.
+    assert First.upper_name is not Second.upper_name
+    assert First.upper_name.state.model is First
+    assert Second.upper_name.state.model is Second
+    assert First.upper_name.field.model is First
+    assert Second.upper_name.field.model is Second
+
+    for model in (First, Second):
+        assert model.upper_name.column_name == "_persisted_upper_name"
+        assert model._meta.get_field("_persisted_upper_name").model is model
+        assert model._meta.get_field("_lookup_property_upper_name").target_property is model.upper_name
+        assert [index.fields for index in model._meta.indexes] == [["_persisted_upper_name"]]
+        assert pre_save.has_listeners(model)
+        assert post_save.has_listeners(model)
+
+    assert First(name="foo").upper_name == "FOO"
@@ -1,8 +1,12 @@
+import datetime
+from types import FunctionType
+
 import pytest
 
 from example_project.example.models import Example
+from lookup_property import L
 from lookup_property.typing import Sentinel
-from tests.factories import AnotherConcreteFactory, ConcreteFactory, ExampleFactory, ThingFactory
+from tests.factories import AnotherConcreteFactory, ConcreteFactory, ExampleFactory, ThingFactory, TotalFactory
 
 pytestmark = [
     pytest.mark.django_db,
@@ -39,6 +43,15 @@ def test_lookup_property__set_attribute():
     assert example.full_name == "foo bar"
 
 
+def test_lookup_property__not_set_on_init():
+    ExampleFactory.create()
+    # Concrete lookup properties are selected from the database like other fields.
+    attnames = {field.attname for field in Example._meta.private_fields if not field.concrete}
+    for example in (Example(first_name="foo", last_name="bar"), Example.objects.first()):
+        assert attnames.isdisjoint(example.__dict__)
+        assert example.full_name == "foo bar"
+
+
 def test_lookup_property__related_property():
     thing = ThingFactory.create()
     assert thing.example.full_name == "foo bar"
@@ -56,6 +69,30 @@ def test_lookup_property__defer():
     assert example.full_name == "foo bar"
 
 
+def test_lookup_property__only__one_query(query_counter):
+    ExampleFactory.create()
+    example = Example.objects.only("pk").first()
+    query_counter.clear()
+
+    # All deferred fields used by the lookup property are loaded with one query.
+    assert example.full_name == "foo bar"
+    assert len(query_counter) == 1
+    assert example.first_name == "foo"
+    assert len(query_counter) == 1
+
+
+def test_lookup_property__only__uses_database(query_counter):
+    example = ExampleFactory.create(age=10)
+    TotalFactory.create(example=example)
+    example = Example.objects.only("pk").first()
+    query_counter.clear()
+
+    # Calculated in the database, since the lookup property would make a query anyway.
+    assert example.age_plus_count_rel == 11
+    assert len(query_counter) == 1
+    assert "age" not in example.__dict__
+
+
 def test_lookup_property__abstract_and_concrete_models():
     concrete = ConcreteFactory.create()
     assert concrete.abstract_property == "abstract property"
@@ -72,3 +109,63 @@ def test_lookup_property__abstract_and_concrete_models__deep():
 def test_lookup_property__refs_another_lookup():
     example = ExampleFactory.create(parts__far__number=1)
     assert example.refs_another_lookup == "foo"
+
+
+def test_lookup_property__evaluate_many(query_counter):
+    ExampleFactory.create(first_name="foo", last_name="bar")
+    ExampleFactory.create(first_name="fizz", last_name="buzz")
+    examples = list(Example.objects.order_by("pk"))
+    query_counter.clear()
+
+    assert Example.full_name.evaluate_many(examples) == ["foo bar", "fizz buzz"]
+    assert len(query_counter) == 1
+
+    # Values are cached on the instances.
+    assert examples[0].full_name == "foo bar"
+    assert examples[1].full_name == "fizz buzz"
+    assert Example.full_name.evaluate_many(examples) == ["foo bar", "fizz buzz"]
+    assert len(query_counter) == 1
+
+
+def test_lookup_property__evaluate_many__joins(query_counter):
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    thing_1 = ThingFactory.create(example=example_1)
+    thing_2 = ThingFactory.create(example=example_2)
+    examples = list(Example.objects.filter(pk__in=[example_1.pk, example_2.pk]).order_by("pk"))
+    query_counter.clear()
+
+    assert Example.reverse_one_to_one.evaluate_many(examples) == [thing_1.pk, thing_2.pk]
+    assert len(query_counter) == 1
+
+
+def test_lookup_property__evaluate_many__aggregate(query_counter):
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1)
+    TotalFactory.create(example=example_1)
+    TotalFactory.create(example=example_2)
+    examples = list(Example.objects.filter(pk__in=[example_1.pk, example_2.pk]).order_by("pk"))
+    query_counter.clear()
+
+    assert Example.count_rel.evaluate_many(examples) == [2, 1]
+    assert len(query_counter) == 1
+
+
+def test_lookup_property__evaluate_many__annotated_and_unsaved(query_counter):
+    ExampleFactory.create(first_name="foo", last_name="bar")
+    annotated = Example.objects.annotate(full_name=L("full_name")).get()
+    unsaved = Example(first_name="fizz", last_name="buzz")
+    query_counter.clear()
+
+    assert Example.full_name.evaluate_many([annotated, unsaved]) == ["foo bar", "fizz buzz"]
+    assert len(query_counter) == 0
+
+
+def test_lookup_property__captured_values_are_globals():
+    func = Example.q_gt.func
+    assert isinstance(func, FunctionType)
+    assert func.__code__.co_argcount == 1
+
+    captured = [value for name, value in func.__globals__.items() if name in Example.q_gt.state.extra_globals]
+    assert captured == [datetime.datetime(2022, 1, 1, tzinfo=datetime.UTC)]
@@ -0,0 +1,237 @@
+import pickle
+import re
+
+import pytest
+
+from example_project.example.models import Example, Other, Thing
+from lookup_property import LookupPropertyQuerySet, batch_lookup_properties
+from tests.factories import ExampleFactory, OtherFactory, ThingFactory, TotalFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def test_prefetch_lookup_properties(query_counter):
+    example_1 = ExampleFactory.create(first_name="foo", last_name="bar")
+    example_2 = ExampleFactory.create(first_name="fizz", last_name="buzz")
+    TotalFactory.create(example=example_1)
+    query_counter.clear()
+
+    examples = list(
+        Example.objects.filter(pk__in=[example_1.pk, example_2.pk])
+        .order_by("pk")
+        .prefetch_lookup_properties("full_name", "count_rel"),
+    )
+    assert len(query_counter) == 3
+
+    assert [example.full_name for example in examples] == ["foo bar", "fizz buzz"]
+    assert [example.count_rel for example in examples] == [1, 0]
+    assert len(query_counter) == 3
+
+
+def test_prefetch_lookup_properties__select_related(query_counter):
+    thing = ThingFactory.create(example__first_name="foo", example__last_name="bar")
+    query_counter.clear()
+
+    things = list(
+        Thing.objects.filter(pk=thing.pk)
+        .select_related("example")
+        .prefetch_lookup_properties("example__full_name", "number_in_range"),
+    )
+    assert len(query_counter) == 3
+
+    assert things[0].example.full_name == "foo bar"
+    assert things[0].number_in_range is True
+    assert len(query_counter) == 3
+
+
+def test_prefetch_lookup_properties__missing_related_object(query_counter):
+    thing = ThingFactory.create(number=12)
+    example = ExampleFactory.create()
+    query_counter.clear()
+
+    examples = list(
+        Example.objects.filter(pk__in=[thing.example.pk, example.pk])
+        .order_by("pk")
+        .select_related("thing")
+        .prefetch_lookup_properties("thing__number_in_range"),
+    )
+    assert len(query_counter) == 2
+
+    assert examples[0].thing.number_in_range is True
+    assert not hasattr(examples[1], "thing")
+    assert len(query_counter) == 2
+
+
+def test_prefetch_lookup_properties__prefetch_related(query_counter):
+    other = OtherFactory.create()
+    ExampleFactory.create(other=other, first_name="foo", last_name="bar")
+    ExampleFactory.create(other=other, first_name="fizz", last_name="buzz")
+    query_counter.clear()
+
+    others = list(
+        LookupPropertyQuerySet(Other)
+        .filter(pk=other.pk)
+        .prefetch_related("examples")
+        .prefetch_lookup_properties("examples__full_name"),
+    )
+    assert len(query_counter) == 3
+
+    assert sorted(example.full_name for example in others[0].examples.all()) == ["fizz buzz", "foo bar"]
+    assert len(query_counter) == 3
+
+
+def test_prefetch_lookup_properties__clear(query_counter):
+    ExampleFactory.create()
+    query_counter.clear()
+
+    list(Example.objects.prefetch_lookup_properties("full_name").prefetch_lookup_properties(None))
+    assert len(query_counter) == 1
+
+
+def test_prefetch_lookup_properties__values(query_counter):
+    ExampleFactory.create()
+    query_counter.clear()
+
+    assert len(Example.objects.prefetch_lookup_properties("full_name").values("pk")) == 1
+    assert len(query_counter) == 1
+
+
+def test_prefetch_lookup_properties__not_a_lookup_property():
+    ExampleFactory.create()
+
+    msg = re.escape("'first_name' is not a lookup property on model 'Example'.")
+    with pytest.raises(ValueError, match=msg):
+        list(Example.objects.prefetch_lookup_properties("first_name"))
+
+
+def test_batch_lookup_properties(query_counter):
+    example_1 = ExampleFactory.create()
+    example_2 = ExampleFactory.create()
+    TotalFactory.create(example=example_1)
+    query_counter.clear()
+
+    examples = list(Example.objects.order_by("pk").batch_lookup_properties())
+    assert len(query_counter) == 1
+
+    # The first access evaluates the lookup property for all instances from the queryset.
+    assert [example.count_rel for example in examples] == [1, 0]
+    assert len(query_counter) == 2
+
+    # Lookup properties that don't need the database are evaluated in python.
+    assert [example.full_name for example in examples] == ["foo bar", "foo bar"]
+    assert len(query_counter) == 2
+
+    assert [example_1.count_rel, example_2.count_rel] == [1, 0]
+    assert len(query_counter) == 4
+
+
+def test_batch_lookup_properties__joins(query_counter):
+    things = ThingFactory.create_batch(3)
+    ExampleFactory.create_batch(2)
+    query_counter.clear()
+
+    examples = list(Example.objects.order_by("pk").batch_lookup_properties())
+    assert Example.reverse_one_to_one.uses_database is True
+
+    # Examples without a thing get `None`, like when the lookup property is annotated.
+    thing_pks = {thing.example_id: thing.pk for thing in things}
+    assert [example.reverse_one_to_one for example in examples] == [thing_pks.get(example.pk) for example in examples]
+    assert len(query_counter) == 2
+
+
+def test_batch_lookup_properties__cache_stale():
+    example = ExampleFactory.create(age=1)
+    TotalFactory.create(example=example)
+    examples = list(Example.objects.batch_lookup_properties())
+
+    assert examples[0].cached_age_plus_count_rel == 2
+    examples[0].age = 100
+    assert examples[0].cached_age_plus_count_rel == 101
+
+
+def test_batch_lookup_properties__not_enabled(query_counter):
+    ExampleFactory.create_batch(2)
+    query_counter.clear()
+
+    examples = list(Example.objects.batch_lookup_properties().batch_lookup_properties(enabled=False))
+    assert [example.count_rel for example in examples] == [0, 0]
+    assert len(query_counter) == 3
+
+
+def test_batch_lookup_properties__instances(query_counter):
+    examples = ExampleFactory.create_batch(2)
+    TotalFactory.create(example=examples[1])
+    query_counter.clear()
+
+    batch_lookup_properties(examples)
+    assert [example.count_rel for example in examples] == [0, 1]
+    assert len(query_counter) == 1
+
+
+def test_batch_lookup_properties__pickle():
+    ExampleFactory.create_batch(2)
+    examples = list(Example.objects.batch_lookup_properties())
+
+    example = pickle.loads(pickle.dumps(examples[0]))  # noqa: S301
+    assert example._state.lookup_property_siblings == []
+
+
+def test_with_lookup_dependencies(query_counter):
+    thing = ThingFactory.create()
+    query_counter.clear()
+
+    queryset = Example.objects.filter(pk=thing.example.pk).with_lookup_dependencies(
+        "reverse_one_to_one",
+        "double_join",
+        "forward_many_to_one",
+    )
+    assert queryset.query.select_related == {"thing": {"far": {}}}
+
+    example = queryset.get()
+    assert example.reverse_one_to_one == thing.pk
+    assert example.double_join == thing.far.pk
+    assert example.forward_many_to_one == thing.example.other.pk
+    assert len(query_counter) == 1
+
+
+def test_with_lookup_dependencies__related(query_counter):
+    thing = ThingFactory.create()
+    query_counter.clear()
+
+    queryset = Thing.objects.filter(pk=thing.pk).with_lookup_dependencies("example__forward_many_to_one")
+    assert queryset.query.select_related == {"example": {}}
+
+    assert queryset.get().example.forward_many_to_one == thing.example.other.pk
+    assert len(query_counter) == 1
+
+
+def test_with_lookup_dependencies__prefetch_related(query_counter):
+    thing = ThingFactory.create()
+    query_counter.clear()
+
+    queryset = LookupPropertyQuerySet(Other).with_lookup_dependencies("examples__reverse_one_to_one")
+    assert queryset._prefetch_related_lookups == ("examples__thing",)
+
+    others = list(queryset)
+    assert [example.reverse_one_to_one for example in others[0].examples.all()] == [thing.pk]
+    assert len(query_counter) == 3
+
+
+def test_with_lookup_dependencies__no_related_objects():
+    queryset = Example.objects.with_lookup_dependencies("full_name", "forward_one_to_one")
+    assert queryset.query.select_related is False
+    assert queryset._prefetch_related_lookups == ()
+
+
+def test_with_lookup_dependencies__not_a_lookup_property():
+    msg = re.escape("'first_name' is not a lookup property on model 'Example'.")
+    with pytest.raises(ValueError, match=msg):
+        Example.objects.with_lookup_dependencies("first_name")
+
+
+def test_with_lookup_dependencies__not_a_relation():
+    msg = re.escape("'first_name' is not a relation on model 'Example'.")
+    with pytest.raises(ValueError, match=msg):
+        Example.objects.with_lookup_dependencies("first_name__full_name")
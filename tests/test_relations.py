@@ -1,7 +1,11 @@
+from inspect import cleandoc
+
 import pytest
+from django.db import models
 
 from example_project.example.models import Example
 from lookup_property import L
+from lookup_property.field import LookupPropertyDescriptor
 from tests.factories import ChildFactory, ExampleFactory, OtherFactory, PartFactory, ThingFactory, TotalFactory
 
 pytestmark = [
@@ -113,3 +117,58 @@ def test_filter_by_lookup__double_join():
     thing = ThingFactory.create(example=example)
     assert Example.objects.filter(_lookup_property_double_join=thing.far.pk).first() == example
     assert Example.objects.filter(L(double_join=thing.far.pk)).first() == example
+
+
+def test_lookup_property__forward_foreign_key__no_query(query_counter):
+    example = ExampleFactory.create()
+    example = Example.objects.get(pk=example.pk)
+
+    query_counter.clear()
+    assert example.forward_many_to_one == example.other_id
+    assert example.forward_one_to_one == example.question_id
+    assert len(query_counter) == 0
+
+
+def thing_name_property(**kwargs) -> LookupPropertyDescriptor:
+    def thing_name():
+        return models.F("thing__name")
+
+    descriptor = LookupPropertyDescriptor(thing_name, **kwargs)
+    descriptor.state.model = Example
+    return descriptor
+
+
+def test_lookup_property__strict_relations__raise():
+    descriptor = thing_name_property(strict_relations="raise")
+    assert descriptor.func_source == cleandoc(
+        """
+        def thing_name(self):
+            return _get_related_object(self, 'thing', 'raise').name
+        """,
+    )
+
+    example = ThingFactory.create(name="foo").example
+    example = Example.objects.get(pk=example.pk)
+
+    msg = "Related object 'thing' of 'example.Example' has not been fetched."
+    with pytest.raises(ValueError, match=msg):
+        descriptor.func(example)
+
+    example = Example.objects.select_related("thing").get(pk=example.pk)
+    assert descriptor.func(example) == "foo"
+
+
+def test_lookup_property__strict_relations__warn():
+    descriptor = thing_name_property(strict_relations="warn")
+
+    example = ThingFactory.create(name="foo").example
+    example = Example.objects.get(pk=example.pk)
+
+    with pytest.warns(RuntimeWarning, match="Related object 'thing' of 'example.Example' has not been fetched."):
+        assert descriptor.func(example) == "foo"
+
+
+def test_lookup_property__strict_relations__setting(settings):
+    settings.LOOKUP_PROPERTY_STRICT_RELATIONS = "raise"
+    assert thing_name_property().state.strict_relations == "raise"
+
@@ -3,6 +3,15 @@
 from example_project.example.models import Example
 
 
+def test_lookup_property__name__source():
+    assert Example.name.func_source == cleandoc(
+        """
+        def name(self):
+            return self.first_name + (' ' + self.last_name)
+        """,
+    )
+
+
 def test_lookup_property__f_ref__source():
     assert Example.f_ref.func_source == cleandoc(
         """
@@ -79,7 +88,7 @@ def test_lookup_property__forward_one_to_one__source():
     assert Example.forward_one_to_one.func_source == cleandoc(
         """
         def forward_one_to_one(self):
-            return self.question.pk
+            return self.question_id
         """,
     )
 
@@ -97,7 +106,7 @@ def test_lookup_property__forward_many_to_one__source():
     assert Example.forward_many_to_one.func_source == cleandoc(
         """
         def forward_many_to_one(self):
-            return self.other.pk
+            return self.other_id
         """,
     )
 
@@ -190,8 +199,8 @@ def q_gte(self):
 def test_lookup_property__q_gt__source():
     assert Example.q_gt.func_source == cleandoc(
         """
-        def q_gt(self, arg0):
-            return self.timestamp > arg0()
+        def q_gt(self):
+            return self.timestamp > arg0
         """,
     )
 
@@ -209,8 +218,8 @@ def q_lte(self):
 def test_lookup_property__q_lt__source():
     assert Example.q_lt.func_source == cleandoc(
         """
-        def q_lt(self, arg1):
-            return self.timestamp < arg1()
+        def q_lt(self):
+            return self.timestamp < arg1
         """,
     )
 
@@ -219,7 +228,7 @@ def test_lookup_property__q_in_list__source():
     assert Example.q_in_list.func_source == cleandoc(
         """
         def q_in_list(self):
-            return self.first_name in ['foo', 'bar']
+            return self.first_name in {'foo', 'bar'}
         """,
     )
 
@@ -228,7 +237,7 @@ def test_lookup_property__q_in_tuple__source():
     assert Example.q_in_tuple.func_source == cleandoc(
         """
         def q_in_tuple(self):
-            return self.first_name in ('foo', 'bar')
+            return self.first_name in {'foo', 'bar'}
         """,
     )
 
@@ -316,8 +325,8 @@ def q_iendswith(self):
 def test_lookup_property__q_range__source():
     assert Example.q_range.func_source == cleandoc(
         """
-        def q_range(self, arg2, arg3):
-            return arg2() < self.timestamp < arg3()
+        def q_range(self):
+            return arg2 < self.timestamp < arg3
         """,
     )
 
@@ -335,8 +344,7 @@ def test_lookup_property__q_regex__source():
     assert Example.q_regex.func_source == cleandoc(
         """
         def q_regex(self):
-            import re
-            return re.match('[a-z]*', self.first_name) is not None
+            return arg4.match(self.first_name) is not None
         """,
     )
 
@@ -345,8 +353,16 @@ def test_lookup_property__q_iregex__source():
     assert Example.q_iregex.func_source == cleandoc(
         """
         def q_iregex(self):
-            import re
-            return re.match('[A-Z]*', self.first_name.casefold()) is not None
+            return arg5.match(self.first_name) is not None
+        """,
+    )
+
+
+def test_lookup_property__q_iregex_field__source():
+    assert Example.q_iregex_field.func_source == cleandoc(
+        """
+        def q_iregex_field(self):
+            return _compile_regex(self.last_name, 2).match(self.first_name) is not None
         """,
     )
 
@@ -443,8 +459,8 @@ def trunc_second(self):
 
 
 def test_lookup_property__trunc_week__source():
-    x = "self.timestamp.replace(hour=0, minute=0, second=0, microsecond=0)"
-    y = "datetime.timedelta(days=self.timestamp.weekday())"
+    x = "(_v0 := self.timestamp).replace(hour=0, minute=0, second=0, microsecond=0)"
+    y = "datetime.timedelta(days=_v0.weekday())"
     assert Example.trunc_week.func_source == cleandoc(
         f"""
         def trunc_week(self):
@@ -455,12 +471,12 @@ def trunc_week(self):
 
 
 def test_lookup_property__trunc_quarter__source():
-    month = "(self.timestamp.month + 2) // 3"
+    month = "(_v0.month + 2) // 3"
     assert Example.trunc_quarter.func_source == cleandoc(
         f"""
         def trunc_quarter(self):
             import datetime
-            return self.timestamp.replace(month={month}, day=1, hour=0, minute=0, second=0, microsecond=0)
+            return (_v0 := self.timestamp).replace(month={month}, day=1, hour=0, minute=0, second=0, microsecond=0)
         """,
     )
 
@@ -604,7 +620,7 @@ def test_lookup_property__strindex__source():
     assert Example.strindex.func_source == cleandoc(
         """
         def strindex(self):
-            return self.first_name.index('o') + 1 if 'o' in self.first_name else 0
+            return _v0.index('o') + 1 if 'o' in (_v0 := self.first_name) else 0
         """,
     )
 
@@ -613,7 +629,7 @@ def test_lookup_property__substr__source():
     assert Example.substr.func_source == cleandoc(
         """
         def substr(self):
-            return self.first_name[2 - 1:]
+            return self.first_name[1:]
         """,
     )
 
@@ -622,7 +638,7 @@ def test_lookup_property__substr_length__source():
     assert Example.substr_length.func_source == cleandoc(
         """
         def substr_length(self):
-            return self.first_name[2 - 1:2 + 1 - 1]
+            return self.first_name[1:2]
         """,
     )
 
@@ -876,21 +892,22 @@ def cast_json(self):
 
 
 def test_lookup_property__coalesce__source():
-    cond_1 = "self.first_name if self.first_name is not None"
+    cond_1 = "_v0 if (_v0 := self.first_name) is not None"
+    cond_2 = "_v1 if (_v1 := self.last_name) is not None"
     assert Example.coalesce.func_source == cleandoc(
         f"""
         def coalesce(self):
-            return {cond_1} else self.last_name if self.last_name is not None else None
+            return {cond_1} else {cond_2} else None
         """,
     )
 
 
 def test_lookup_property__coalesce_2__source():
-    full_name = "self.first_name + self.last_name"
+    full_name = "(_v0 := (self.first_name + self.last_name))"
     assert Example.coalesce_2.func_source == cleandoc(
         f"""
         def coalesce_2(self):
-            return {full_name} if {full_name} is not None else '.' if '.' != None else None
+            return _v0 if {full_name} is not None else '.'
         """,
     )
 
@@ -917,7 +934,7 @@ def test_lookup_property__json_object__source():
     assert Example.json_object.func_source == cleandoc(
         """
         def json_object(self):
-            return {'name': self.name.upper(), 'alias': 'alias', 'age': self.age * 2}
+            return {'name': (self.first_name + (' ' + self.last_name)).upper(), 'alias': 'alias', 'age': self.age * 2}
         """,
     )
 
@@ -926,7 +943,7 @@ def test_lookup_property__nullif__source():
     assert Example.nullif.func_source == cleandoc(
         """
         def nullif(self):
-            return None if self.first_name == self.last_name else self.first_name
+            return None if (_v0 := self.first_name) == self.last_name else _v0
         """,
     )
 
@@ -986,12 +1003,12 @@ def extract_second(self):
 
 
 def test_lookup_property__extract_quarter__source():
-    month = "(self.timestamp.month + 2) // 3"
+    month = "(_v0.month + 2) // 3"
     assert Example.extract_quarter.func_source == cleandoc(
         f"""
         def extract_quarter(self):
             import datetime
-            return self.timestamp.replace(month={month}, day=1, hour=0, minute=0, second=0, microsecond=0)
+            return (_v0 := self.timestamp).replace(month={month}, day=1, hour=0, minute=0, second=0, microsecond=0)
         """,
     )
 
@@ -1223,7 +1240,7 @@ def test_lookup_property__sign__source():
     assert Example.sign.func_source == cleandoc(
         """
         def sign(self):
-            return int(self.number > 0) - int(self.number < 0)
+            return int((_v0 := self.number) > 0) - int(_v0 < 0)
         """,
     )
 
@@ -1261,8 +1278,8 @@ def tan(self):
 def test_lookup_property__count_field__source():
     assert Example.count_field.func_source == cleandoc(
         """
-        def count_field(self, arg4):
-            return self.__class__.objects.aggregate(arg4=arg4())['arg4']
+        def count_field(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg6=arg6)['arg6']
         """,
     )
 
@@ -1270,8 +1287,8 @@ def count_field(self, arg4):
 def test_lookup_property__count_field_filter__source():
     assert Example.count_field_filter.func_source == cleandoc(
         """
-        def count_field_filter(self, arg5):
-            return self.__class__.objects.aggregate(arg5=arg5())['arg5']
+        def count_field_filter(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg7=arg7)['arg7']
         """,
     )
 
@@ -1279,8 +1296,8 @@ def count_field_filter(self, arg5):
 def test_lookup_property__count_rel__source():
     assert Example.count_rel.func_source == cleandoc(
         """
-        def count_rel(self, arg6):
-            return self.__class__.objects.aggregate(arg6=arg6())['arg6']
+        def count_rel(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg8=arg8)['arg8']
         """,
     )
 
@@ -1288,8 +1305,8 @@ def count_rel(self, arg6):
 def test_lookup_property__count_rel_filter__source():
     assert Example.count_rel_filter.func_source == cleandoc(
         """
-        def count_rel_filter(self, arg7):
-            return self.__class__.objects.aggregate(arg7=arg7())['arg7']
+        def count_rel_filter(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg9=arg9)['arg9']
         """,
     )
 
@@ -1317,8 +1334,8 @@ def _(self) -> int:
 def test_lookup_property__max__source():
     assert Example.max_.func_source == cleandoc(
         """
-        def max_(self, arg8):
-            return self.__class__.objects.aggregate(arg8=arg8())['arg8']
+        def max_(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg10=arg10)['arg10']
         """,
     )
 
@@ -1326,8 +1343,8 @@ def max_(self, arg8):
 def test_lookup_property__max_rel__source():
     assert Example.max_rel.func_source == cleandoc(
         """
-        def max_rel(self, arg9):
-            return self.__class__.objects.aggregate(arg9=arg9())['arg9']
+        def max_rel(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg11=arg11)['arg11']
         """,
     )
 
@@ -1335,8 +1352,8 @@ def max_rel(self, arg9):
 def test_lookup_property__min__source():
     assert Example.min_.func_source == cleandoc(
         """
-        def min_(self, arg10):
-            return self.__class__.objects.aggregate(arg10=arg10())['arg10']
+        def min_(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg12=arg12)['arg12']
         """,
     )
 
@@ -1344,8 +1361,8 @@ def min_(self, arg10):
 def test_lookup_property__min_rel__source():
     assert Example.min_rel.func_source == cleandoc(
         """
-        def min_rel(self, arg11):
-            return self.__class__.objects.aggregate(arg11=arg11())['arg11']
+        def min_rel(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg13=arg13)['arg13']
         """,
     )
 
@@ -1353,8 +1370,8 @@ def min_rel(self, arg11):
 def test_lookup_property__sum__source():
     assert Example.sum_.func_source == cleandoc(
         """
-        def sum_(self, arg12):
-            return self.__class__.objects.aggregate(arg12=arg12())['arg12']
+        def sum_(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg14=arg14)['arg14']
         """,
     )
 
@@ -1362,8 +1379,8 @@ def sum_(self, arg12):
 def test_lookup_property__sum_rel__source():
     assert Example.sum_rel.func_source == cleandoc(
         """
-        def sum_rel(self, arg13):
-            return self.__class__.objects.aggregate(arg13=arg13())['arg13']
+        def sum_rel(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg15=arg15)['arg15']
         """,
     )
 
@@ -1371,8 +1388,8 @@ def sum_rel(self, arg13):
 def test_lookup_property__sum_filter__source():
     assert Example.sum_filter.func_source == cleandoc(
         """
-        def sum_filter(self, arg14):
-            return self.__class__.objects.aggregate(arg14=arg14())['arg14']
+        def sum_filter(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg16=arg16)['arg16']
         """,
     )
 
@@ -1380,8 +1397,8 @@ def sum_filter(self, arg14):
 def test_lookup_property__avg__source():
     assert Example.avg.func_source == cleandoc(
         """
-        def avg(self, arg15):
-            return self.__class__.objects.aggregate(arg15=arg15())['arg15']
+        def avg(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg17=arg17)['arg17']
         """,
     )
 
@@ -1389,8 +1406,8 @@ def avg(self, arg15):
 def test_lookup_property__std_dev__source():
     assert Example.std_dev.func_source == cleandoc(
         """
-        def std_dev(self, arg16):
-            return self.__class__.objects.aggregate(arg16=arg16())['arg16']
+        def std_dev(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg18=arg18)['arg18']
         """,
     )
 
@@ -1398,8 +1415,8 @@ def std_dev(self, arg16):
 def test_lookup_property__variance__source():
     assert Example.variance.func_source == cleandoc(
         """
-        def variance(self, arg17):
-            return self.__class__.objects.aggregate(arg17=arg17())['arg17']
+        def variance(self):
+            return self.__class__._base_manager.filter(pk=self.pk).aggregate(arg19=arg19)['arg19']
         """,
     )
 
@@ -1411,3 +1428,13 @@ def refs_another_lookup(self):
             return 'foo' if self.reffed_by_another_lookup == 1 else 'bar'
         """,
     )
+
+
+def test_lookup_property__initials__source():
+    # Slices are not assigned to variables, since `x[(_v0 := 0:1)]` is not valid syntax.
+    assert Example.initials.func_source == cleandoc(
+        """
+        def initials(self):
+            return self.first_name[0:1] + self.last_name[0:1]
+        """,
+    )
@@ -1,9 +1,13 @@
-from django.db.models import F, Q
+import ast
+from inspect import cleandoc
+
+from django.db.models import Case, F, Q, Value, When
 from django.db.models.expressions import CombinedExpression, NegatedExpression
 from django.db.models.functions import Upper
 
 from example_project.example.models import Example
 from lookup_property import L
+from lookup_property.converters.utils import attribute_paths
 from lookup_property.expressions import extend_expression_to_joined_table
 
 
@@ -195,3 +199,40 @@ def test_extend_expression_to_joined_table__value_is_func():
     q2 = extend_expression_to_joined_table(q1, "example")
 
     assert str(q2.children) == "[L(example__foo=Upper(F(example__bar)))]"
+
+
+def test_extend_expression_to_joined_table__original_not_modified():
+    q1 = Q(L(foo=Upper("bar"))) & Q(fizz=F("buzz"))
+    q2 = extend_expression_to_joined_table(q1, "example")
+
+    assert str(q1) == "(AND: L(foo=Upper(F(bar))), ('fizz', F(buzz)))"
+    assert str(q2) == "(AND: L(example__foo=Upper(F(example__bar))), ('example__fizz', F(example__buzz)))"
+
+
+def test_extend_expression_to_joined_table__unchanged_parts_are_shared():
+    value = Value("foo")
+    case = Case(When(Q(foo=1), then=value), default=Upper(Value("bar")))
+    case_2 = extend_expression_to_joined_table(case, "example")
+
+    assert str(case_2) == "CASE WHEN <Q: (AND: ('example__foo', 1))> THEN Value('foo'), ELSE Upper(Value('bar'))"
+    assert case_2 is not case
+    assert case_2.cases[0].result is value
+    assert case_2.default is case.default
+
+
+def test_extend_expression_to_joined_table__nothing_to_rewrite():
+    expression = Upper(Value("bar"))
+    assert extend_expression_to_joined_table(expression, "example") is expression
+
+
+def test_attribute_paths():
+    module = ast.parse(
+        cleandoc(
+            """
+            def foo(self):
+                return (_v0 := self.foo).bar + _v0.baz + _get_related_object(self, 'fizz', 'raise').buzz + other.attr
+            """,
+        ),
+    )
+    paths = attribute_paths(module)
+    assert sorted(paths) == [["fizz"], ["fizz", "buzz"], ["foo"], ["foo", "bar"], ["foo", "baz"]]